@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8
+"""
+Times the stages of the router generation on synthetic menu trees. The benchmark runs with the test settings in a test
+database and a local memory cache, it never touches the database or the caches of a project.
+"""
+from __future__ import unicode_literals, absolute_import
+
+import argparse
+import json
+import os
+import sys
+
+import django
+
+
+def get_argument_parser():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 1000],
+                        help='Number of menu nodes of each tree.')
+    parser.add_argument('--page-ratio', type=float, default=0.2,
+                        help='Share of CMS pages in the menu nodes, the others are apphook nodes.')
+    parser.add_argument('--depth', type=int, default=3, help='Max. depth of the CMS page tree.')
+    parser.add_argument('--named-route-groups', type=int, default=5,
+                        help='Number of apphooks, the detail nodes of an apphook share a named route.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs per tree.')
+    parser.add_argument('--language', default='en')
+    parser.add_argument('--warm-cache', action='store_true', help='Also time the router with a warm route cache.')
+    parser.add_argument('--save', metavar='PATH', help='Save the results as baseline.')
+    parser.add_argument('--compare', metavar='PATH', help='Compare the results with a saved baseline.')
+    parser.add_argument('--max-regression', type=float, metavar='PERCENT',
+                        help='Fail if the median of a stage is slower than the baseline by more than PERCENT.')
+    return parser
+
+
+def benchmark_tree(size, options):
+    from django.conf import settings
+    from django.db import transaction
+    from django.test.utils import override_settings
+
+    from djangocms_spa_vue_js.cache_helpers import clear_route_skeletons
+    from tests.benchmark_helpers import (benchmark_vue_js_router, create_synthetic_page_tree, get_benchmark_summary,
+                                         get_synthetic_apphook_nodes)
+
+    results = {}
+    page_count = int(round(size * options.page_ratio))
+
+    with transaction.atomic():
+        print('Creating %d pages and %d apphook nodes...' % (page_count, size - page_count))
+        create_synthetic_page_tree(size=page_count, depth=options.depth, language=options.language)
+        apphook_nodes = get_synthetic_apphook_nodes(
+            size=size - page_count,
+            named_route_groups=options.named_route_groups,
+            language=options.language
+        )
+
+        cache_timeouts = {'cold': 0}
+        if options.warm_cache:
+            cache_timeouts['warm'] = settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT or 60 * 60
+
+        for use_i18n_patterns in (False, True):
+            for cache_name, cache_timeout in cache_timeouts.items():
+                scenario = 'nodes=%d i18n=%s cache=%s' % (size, 'on' if use_i18n_patterns else 'off', cache_name)
+                with override_settings(DJANGOCMS_SPA_VUE_JS_USE_I18N_PATTERNS=use_i18n_patterns,
+                                       DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT=cache_timeout):
+                    if cache_timeout:
+                        clear_route_skeletons()
+                        benchmark_vue_js_router(apphook_nodes, language=options.language, repeat=1)
+
+                    durations = benchmark_vue_js_router(apphook_nodes, language=options.language,
+                                                        repeat=options.repeat)
+                results[scenario] = get_benchmark_summary(durations)
+
+        transaction.set_rollback(True)
+
+    return results
+
+
+def write_results(results):
+    from tests.benchmark_helpers import BENCHMARK_STAGES
+
+    print('%-36s %-18s %10s %10s' % ('scenario', 'stage', 'min ms', 'median ms'))
+    for scenario, stages in results.items():
+        for stage in BENCHMARK_STAGES:
+            print('%-36s %-18s %10.2f %10.2f' % (
+                scenario, stage, stages[stage]['min'] * 1000, stages[stage]['median'] * 1000
+            ))
+
+
+def write_comparison(results, baseline, max_regression=None):
+    """
+    Prints the medians of the results next to the baseline and returns the stages that are slower than the baseline
+    by more than `max_regression` percent.
+    """
+    from tests.benchmark_helpers import BENCHMARK_STAGES
+
+    regressions = []
+    print('%-36s %-18s %12s %12s %8s' % ('scenario', 'stage', 'baseline ms', 'median ms', 'change'))
+    for scenario, stages in results.items():
+        for stage in BENCHMARK_STAGES:
+            median = stages[stage]['median']
+            try:
+                baseline_median = baseline[scenario][stage]['median']
+            except KeyError:
+                print('%-36s %-18s %12s %12.2f %8s' % (scenario, stage, '-', median * 1000, '-'))
+                continue
+
+            change = (median - baseline_median) / baseline_median * 100 if baseline_median else 0
+            print('%-36s %-18s %12.2f %12.2f %+7.1f%%' % (
+                scenario, stage, baseline_median * 1000, median * 1000, change
+            ))
+            if max_regression is not None and change > max_regression:
+                regressions.append('%s %s' % (scenario, stage))
+
+    return regressions
+
+
+def run_benchmark(*args):
+    options = get_argument_parser().parse_args(args)
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'tests.settings'
+    django.setup()
+
+    from django.test.runner import DiscoverRunner
+
+    runner = DiscoverRunner(verbosity=0)
+    runner.setup_test_environment()
+    old_config = runner.setup_databases()
+    try:
+        results = {}
+        for size in options.sizes:
+            results.update(benchmark_tree(size=size, options=options))
+    finally:
+        runner.teardown_databases(old_config)
+        runner.teardown_test_environment()
+
+    if options.save:
+        with open(options.save, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = write_comparison(results, baseline, max_regression=options.max_regression)
+        if regressions:
+            sys.exit('Slower than the baseline: %s' % ', '.join(regressions))
+    else:
+        write_results(results)
+
+
+if __name__ == '__main__':
+    run_benchmark(*sys.argv[1:])
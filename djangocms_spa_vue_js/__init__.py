@@ -1 +1,3 @@
 __version__ = '0.1.29'
+
+default_app_config = 'djangocms_spa_vue_js.apps.DjangoCmsSpaVueJsConfig'
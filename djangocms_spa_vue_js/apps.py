@@ -0,0 +1,34 @@
+from django.apps import AppConfig
+
+
+class DjangoCmsSpaVueJsConfig(AppConfig):
+    name = 'djangocms_spa_vue_js'
+
+    def ready(self):
+        from cms.models import Page
+        from cms.signals import (page_moved, post_obj_operation, post_placeholder_operation, post_publish,
+                                 post_unpublish, urls_need_reloading)
+        from django.core.signals import setting_changed
+        from django.db.models.signals import post_delete, post_save, pre_delete
+
+        from .cache_helpers import update_router_version
+        from .signals import (invalidate_routes_on_model_change, invalidate_routes_on_page_delete,
+                              invalidate_routes_on_page_moved, invalidate_routes_on_page_operation,
+                              invalidate_routes_on_publish)
+        from .router_helpers import clear_route_metadata
+        from .url_helpers import clear_resolved_urls, clear_url_templates
+
+        post_publish.connect(invalidate_routes_on_publish, dispatch_uid='vue_js_router_post_publish')
+        post_unpublish.connect(invalidate_routes_on_publish, dispatch_uid='vue_js_router_post_unpublish')
+        page_moved.connect(invalidate_routes_on_page_moved, dispatch_uid='vue_js_router_page_moved')
+        post_obj_operation.connect(invalidate_routes_on_page_operation, dispatch_uid='vue_js_router_page_operation')
+        pre_delete.connect(invalidate_routes_on_page_delete, sender=Page, dispatch_uid='vue_js_router_page_delete')
+        post_save.connect(invalidate_routes_on_model_change, dispatch_uid='vue_js_router_model_save')
+        post_delete.connect(invalidate_routes_on_model_change, dispatch_uid='vue_js_router_model_delete')
+        post_placeholder_operation.connect(update_router_version, dispatch_uid='vue_js_router_placeholder_operation')
+
+        urls_need_reloading.connect(clear_resolved_urls, dispatch_uid='vue_js_router_urls_need_reloading')
+        setting_changed.connect(clear_resolved_urls, dispatch_uid='vue_js_router_setting_changed')
+        urls_need_reloading.connect(clear_url_templates, dispatch_uid='vue_js_router_url_templates_need_reloading')
+        setting_changed.connect(clear_url_templates, dispatch_uid='vue_js_router_url_templates_setting_changed')
+        setting_changed.connect(clear_route_metadata, dispatch_uid='vue_js_router_route_metadata_setting_changed')
@@ -0,0 +1,420 @@
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass
+
+from cms.toolbar.utils import get_toolbar_from_request
+from cms.utils.conf import get_cms_setting
+from django.conf import settings
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+
+ROUTER_CACHE_VARIANTS = ('anonymous', 'authenticated')
+ROUTE_SKELETON_FORMAT = 7  # increase it whenever the format of the cached route entries changes
+ROUTE_SKELETON_LOCK_POLL_INTERVAL = 0.05  # seconds between two checks whether the lock has been released
+MODEL_ROUTES_GENERATION_SCOPE = 'models'  # the invalidation generation of the model routes, shared by all sites
+
+
+def is_editor(user):
+    return user.is_staff or user.has_perm('cms.change_page') or user.has_perm('cms.edit_static_placeholder')
+
+
+def get_router_cache_variant(request):
+    """
+    Returns the visibility variant of the request. The router depends on the variant, not on the individual user:
+    authenticated users see the nodes that require a login. Routes are cached per variant instead of per user. Editors
+    (see `is_editor`) get draft nodes, editable page data and partials, they have no variant (`None`) and their routes
+    and responses are never cached.
+    """
+    if '_vue_js_router_cache_variant' not in request.__dict__:
+        user = request.user
+        if not user.is_authenticated:
+            variant = 'anonymous'
+        elif is_editor(user):
+            variant = None
+        else:
+            variant = 'authenticated'
+        request.__dict__['_vue_js_router_cache_variant'] = variant
+    return request.__dict__['_vue_js_router_cache_variant']
+
+
+def is_shared_router_cache_variant(variant):
+    """
+    Returns `True` if the responses of the router views can be shared by all users of the variant (see
+    `DJANGOCMS_SPA_VUE_JS_SHARED_ROUTER_VARIANTS`).
+    """
+    # With CMS permissions the visible pages depend on the user, only the responses of anonymous users can be shared.
+    if variant != 'anonymous' and get_cms_setting('PERMISSION'):
+        return False
+    return variant in settings.DJANGOCMS_SPA_VUE_JS_SHARED_ROUTER_VARIANTS
+
+
+def get_route_skeleton_cache_key(language, site_id, variant):
+    return '{prefix}vue_js_route_skeleton_{format}_{language}_{site_id}_{variant}'.format(
+        prefix=get_cms_setting('CACHE_PREFIX'),
+        format=ROUTE_SKELETON_FORMAT,
+        language=language,
+        site_id=site_id,
+        variant=variant
+    )
+
+
+def get_route_skeleton_cache_key_for_request(request, renderer):
+    return get_route_skeleton_cache_key(
+        language=request.LANGUAGE_CODE,
+        site_id=renderer.site.pk,
+        variant=get_router_cache_variant(request)
+    )
+
+
+def is_route_skeleton_cache_active(renderer):
+    # Editors see draft nodes that change without being published, we never cache them.
+    if not settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT or renderer.draft_mode_active:
+        return False
+    return get_router_cache_variant(renderer.request) is not None
+
+
+@dataclass
+class RouteSkeleton:
+    routes: dict  # {node_key: route_entry}
+    generation: tuple  # the invalidation generations (site, model routes) the routes have been checked against
+    is_outdated: bool = False  # `True` if the cached routes have been checked against an older generation
+
+
+def get_route_skeleton(request, renderer):
+    """
+    Returns the cached, request independent routes of all menu nodes as a `RouteSkeleton` or `None` if the cache is
+    not active for this request. Routes that have been invalidated since they were built are flagged as `invalidated`
+    (see `invalidate_routes`), routes that passed their hard timeout are left out.
+    """
+    if not is_route_skeleton_cache_active(renderer):
+        return None
+
+    # Read the generations first: if routes are invalidated meanwhile, a generation changes again and the next
+    # request checks the routes once more.
+    generation = (get_route_invalidation_generation(renderer.site.pk),
+                  get_route_invalidation_generation(MODEL_ROUTES_GENERATION_SCOPE))
+    cached_route_skeleton = cache.get(get_route_skeleton_cache_key_for_request(request, renderer))
+    if cached_route_skeleton is None:
+        return RouteSkeleton(routes={}, generation=generation)
+
+    now = time.time()
+    route_skeleton = RouteSkeleton(
+        routes={
+            node_key: route_entry for node_key, route_entry in cached_route_skeleton['routes'].items()
+            if route_entry['expires_at'] > now
+        },
+        generation=generation
+    )
+    site_generation, model_routes_generation = cached_route_skeleton['generation']
+    if site_generation != generation[0]:
+        route_skeleton.is_outdated = True
+        flag_invalidated_route_entries(route_skeleton.routes.values())
+    elif model_routes_generation != generation[1]:
+        # Only the routes of models have been invalidated (see `invalidate_model_routes`), the pages are not affected.
+        route_skeleton.is_outdated = True
+        flag_invalidated_route_entries([
+            route_entry for route_entry in route_skeleton.routes.values() if not route_entry['is_page']
+        ])
+    return route_skeleton
+
+
+def set_route_skeleton(request, renderer, route_skeleton):
+    """
+    Caches the routes of the route skeleton. Invalidated routes are left out, the routes are written as a whole but
+    never change the invalidations of other requests.
+    """
+    if not is_route_skeleton_cache_active(renderer):
+        return
+
+    cache_key = get_route_skeleton_cache_key_for_request(request, renderer)
+    cache.set(cache_key, {
+        'generation': route_skeleton.generation,
+        'routes': {
+            node_key: route_entry for node_key, route_entry in route_skeleton.routes.items()
+            if not is_invalidated_route_entry(route_entry)
+        },
+    }, settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT)
+
+
+def acquire_route_skeleton_lock(request, renderer):
+    """
+    Returns `True` if this worker may rebuild the stale routes of the route skeleton. The lock is shared by all
+    processes through the cache and released by `set_route_skeleton` (or expires after
+    `DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_LOCK_TIMEOUT` seconds).
+    """
+    lock_cache_key = get_route_skeleton_lock_cache_key(request, renderer)
+    return cache.add(lock_cache_key, True, settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_LOCK_TIMEOUT)
+
+
+def release_route_skeleton_lock(request, renderer):
+    cache.delete(get_route_skeleton_lock_cache_key(request, renderer))
+
+
+def wait_for_route_skeleton_lock(request, renderer):
+    """
+    Waits until the worker holding the lock has cached the routes or the lock has expired.
+    """
+    wait_for_cache_lock(get_route_skeleton_lock_cache_key(request, renderer))
+
+
+def wait_for_cache_lock(lock_cache_key):
+    timeout = time.monotonic() + settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_LOCK_TIMEOUT
+    while cache.get(lock_cache_key) is not None and time.monotonic() < timeout:
+        time.sleep(ROUTE_SKELETON_LOCK_POLL_INTERVAL)
+
+
+def get_route_skeleton_lock_cache_key(request, renderer):
+    return '%s_lock' % get_route_skeleton_cache_key_for_request(request, renderer)
+
+
+def is_stale_route_entry(route_entry):
+    return is_invalidated_route_entry(route_entry) or route_entry['fresh_until'] < time.time()
+
+
+def is_invalidated_route_entry(route_entry):
+    # Invalidated routes are outdated, routes that passed their soft timeout are just old.
+    return route_entry.get('invalidated', False)
+
+
+def disable_response_caches(request):
+    """
+    Keeps the response of the request out of the CMS page cache and the router view cache, e.g. because it contains
+    invalidated routes. Responses of other requests are not affected.
+    """
+    request.__dict__['_vue_js_response_cache_disabled'] = True
+    get_toolbar_from_request(request)._cache_disabled = True
+
+
+def is_response_cache_disabled(request):
+    return request.__dict__.get('_vue_js_response_cache_disabled', False)
+
+
+def get_route_skeleton_cache_keys(site_ids=None):
+    if site_ids is None:
+        site_ids = Site.objects.values_list('pk', flat=True)
+
+    return [
+        get_route_skeleton_cache_key(language=language_code, site_id=site_id, variant=variant)
+        for site_id in site_ids
+        for language_code, language in settings.LANGUAGES
+        for variant in ROUTER_CACHE_VARIANTS
+    ]
+
+
+def get_route_invalidation_cache_key(kind, value):
+    return '{prefix}vue_js_route_invalidation_{kind}_{value}'.format(
+        prefix=get_cms_setting('CACHE_PREFIX'),
+        kind=kind,
+        value=hashlib.md5(str(value).encode('utf-8')).hexdigest()
+    )
+
+
+def get_route_invalidation_cache_keys(route_entry):
+    """
+    Returns the cache keys of the invalidations that affect the route entry: the invalidations of its pages, its URL
+    and its named route group.
+    """
+    cache_keys = [get_route_invalidation_cache_key('page', page_id) for page_id in route_entry['page_ids']]
+    cache_keys.append(get_route_invalidation_cache_key('url', route_entry['url']))
+    if route_entry['named_route_group']:
+        cache_keys.append(get_route_invalidation_cache_key('named_route_group', route_entry['named_route_group']))
+    return cache_keys
+
+
+def get_route_invalidation_generation_cache_key(scope):
+    # The scope is the id of a site or `MODEL_ROUTES_GENERATION_SCOPE`.
+    return '{prefix}vue_js_route_invalidation_generation_{scope}'.format(
+        prefix=get_cms_setting('CACHE_PREFIX'),
+        scope=scope
+    )
+
+
+def get_route_invalidation_generation(scope):
+    cache_key = get_route_invalidation_generation_cache_key(scope)
+    generation = cache.get(cache_key)
+    if generation is None:
+        cache.add(cache_key, uuid.uuid4().hex, None)
+        generation = cache.get(cache_key)
+    return generation
+
+
+def flag_invalidated_route_entries(route_entries):
+    """
+    Flags the route entries that have been invalidated after they were built as `invalidated`. The invalidations of all
+    entries are loaded with one query.
+    """
+    route_entries = [(route_entry, get_route_invalidation_cache_keys(route_entry)) for route_entry in route_entries]
+    invalidations = cache.get_many({cache_key for _, cache_keys in route_entries for cache_key in cache_keys})
+    if not invalidations:
+        return
+
+    for route_entry, cache_keys in route_entries:
+        invalidated_at = max((invalidations[cache_key] for cache_key in cache_keys if cache_key in invalidations),
+                             default=None)
+        if invalidated_at is not None and invalidated_at >= route_entry['built_at']:
+            route_entry['invalidated'] = True
+
+
+def invalidate_routes(site_ids=None, page_ids=None, urls=None, named_route_groups=None):
+    """
+    Marks the routes of the given pages (including all their descendants and attached apphook nodes), URLs and named
+    route groups (see `get_named_route_group`) as stale. The stale routes are served until one request has rebuilt
+    them, all other routes stay fresh.
+
+    The cached routes themselves are not changed: each invalidation is stored under its own key with its time, and the
+    invalidation generation of the given sites (default: all sites) changes. Requests check their cached routes against
+    these invalidations whenever the generation has changed since they were cached.
+    """
+    set_route_invalidations(page_ids=page_ids, urls=urls, named_route_groups=named_route_groups)
+
+    if site_ids is None:
+        site_ids = Site.objects.values_list('pk', flat=True)
+    cache.set_many({get_route_invalidation_generation_cache_key(site_id): uuid.uuid4().hex for site_id in site_ids},
+                   None)
+
+
+def invalidate_model_routes(urls=None, named_route_groups=None):
+    """
+    Marks the routes of the given URLs and named route groups of models as stale, like `invalidate_routes` does. Only
+    the generation of the model routes changes, requests of all sites check their model routes against these
+    invalidations but the routes of the pages stay as they are.
+    """
+    set_route_invalidations(urls=urls, named_route_groups=named_route_groups)
+    cache.set(get_route_invalidation_generation_cache_key(MODEL_ROUTES_GENERATION_SCOPE), uuid.uuid4().hex, None)
+
+
+def set_route_invalidations(page_ids=None, urls=None, named_route_groups=None):
+    invalidated_at = time.time()
+    invalidations = {}
+    for page_id in page_ids or []:
+        invalidations[get_route_invalidation_cache_key('page', page_id)] = invalidated_at
+    for url in urls or []:
+        invalidations[get_route_invalidation_cache_key('url', url)] = invalidated_at
+    for named_route_group in named_route_groups or []:
+        invalidations[get_route_invalidation_cache_key('named_route_group', named_route_group)] = invalidated_at
+    # Routes expire after the same timeout (see `get_route_entry`), older invalidations don't affect any cached route.
+    cache.set_many(invalidations, settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT)
+
+
+def clear_route_skeletons(site_ids=None):
+    cache.delete_many(get_route_skeleton_cache_keys(site_ids))
+    update_router_version()
+
+
+def get_router_version_cache_key():
+    return '%svue_js_router_version' % get_cms_setting('CACHE_PREFIX')
+
+
+def get_router_version():
+    """
+    Returns a random version that changes whenever routes have been rebuilt or placeholders change. Views validate
+    their responses by the router state (see `get_router_state`) without building the router.
+    """
+    router_version = cache.get(get_router_version_cache_key())
+    if router_version is None:
+        cache.add(get_router_version_cache_key(), uuid.uuid4().hex, None)
+        router_version = cache.get(get_router_version_cache_key())
+    return router_version
+
+
+def update_router_version(**kwargs):
+    cache.set(get_router_version_cache_key(), uuid.uuid4().hex, None)
+
+
+def get_router_state(site_id):
+    """
+    Returns the router version together with the invalidation generations of the site and the model routes. The router
+    version changes when invalidated routes have been rebuilt, the state changes as soon as routes are invalidated.
+    Responses validated by the state are never served with invalidated routes.
+    """
+    return '%s_%s_%s' % (get_router_version(), get_route_invalidation_generation(site_id),
+                         get_route_invalidation_generation(MODEL_ROUTES_GENERATION_SCOPE))
+
+
+def get_partials_version_cache_key():
+    return '%svue_js_partials_version' % get_cms_setting('CACHE_PREFIX')
+
+
+def get_partials_version():
+    partials_version = cache.get(get_partials_version_cache_key())
+    if partials_version is None:
+        cache.add(get_partials_version_cache_key(), uuid.uuid4().hex, None)
+        partials_version = cache.get(get_partials_version_cache_key())
+    return partials_version
+
+
+def update_partials_version(**kwargs):
+    cache.set(get_partials_version_cache_key(), uuid.uuid4().hex, None)
+
+
+def get_partials_cache_key(static_placeholder_names, language, site_id, editable):
+    """
+    Returns the cache key of the rendered static placeholders. Publishing a static placeholder changes the version of
+    all keys.
+    """
+    return '{prefix}vue_js_partials_{version}_{names}_{language}_{site_id}_{editable}'.format(
+        prefix=get_cms_setting('CACHE_PREFIX'),
+        version=get_partials_version(),
+        names=hashlib.md5(','.join(sorted(static_placeholder_names)).encode('utf-8')).hexdigest(),
+        language=language,
+        site_id=site_id,
+        editable=int(editable)
+    )
+
+
+def get_prefetched_page_data_cache_key(router_version, site_id, variant, language, page_id):
+    return '{prefix}vue_js_prefetched_page_data_{router_version}_{site_id}_{variant}_{language}_{page_id}'.format(
+        prefix=get_cms_setting('CACHE_PREFIX'),
+        router_version=router_version,
+        site_id=site_id,
+        variant=variant,
+        language=language,
+        page_id=page_id
+    )
+
+
+def get_route_entry(node, node_route, built_at, url_name=None):
+    """
+    Returns the cache entry of a route. Besides the route itself it stores everything we need to decide whether the
+    route is still valid and which changes affect it. `built_at` is the time before the data of the route was loaded.
+    """
+    return {
+        'route': node_route,
+        'built_at': built_at,
+        'fresh_until': built_at + settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_SOFT_TIMEOUT,
+        'expires_at': built_at + settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT,
+        'url': node.get_absolute_url(),
+        'url_name': url_name,
+        'is_page': bool(node.attr.get('is_page')),
+        'page_ids': get_node_page_ids(node),
+        'named_route_group': get_named_route_group(node.attr.get('vue_js_router_name'),
+                                                   node.attr.get('named_route_path_pattern')),
+    }
+
+
+def get_named_route_group(vue_js_router_name, named_route_path_pattern):
+    """
+    Returns the key of the group of routes that share a named route path pattern. The same pattern (e.g. `:slug`) is
+    used by many models, the group includes the router name of the model (e.g. `news-article:slug`).
+    """
+    if not named_route_path_pattern:
+        return None
+    return '%s%s' % (vue_js_router_name or '', named_route_path_pattern)
+
+
+def get_node_page_ids(node):
+    """
+    Returns the ids of the CMS pages of the node and all its ancestors. A change of one of these pages may change the
+    route of the node (e.g. its path).
+    """
+    page_ids = []
+    while node:
+        if node.attr.get('is_page'):
+            page_ids.append(node.id)
+        node = node.parent
+    return page_ids
+
+
+def get_node_key(node):
+    return '%s:%s' % (node.namespace, node.id)
@@ -1,21 +1,180 @@
+import time
 from dataclasses import dataclass
 
-from cms.models import Page
+from cms.constants import TEMPLATE_INHERITANCE_MAGIC
+from cms.models import Page, Title, TreeNode
+from cms.utils.conf import get_cms_setting
+from cms.utils.i18n import get_fallback_languages
 from django.utils.text import slugify
 from menus.base import Modifier
 from menus.menu_pool import menu_pool
 
-from djangocms_spa_vue_js.menu_helpers import get_node_route
+from djangocms_spa_vue_js.cache_helpers import (acquire_route_skeleton_lock, disable_response_caches, get_node_key,
+                                                get_route_entry, get_route_skeleton, is_invalidated_route_entry,
+                                                is_stale_route_entry, release_route_skeleton_lock, set_route_skeleton,
+                                                update_router_version, wait_for_route_skeleton_lock)
+from djangocms_spa_vue_js.json_helpers import dumps, get_compact_route_fragment
+from djangocms_spa_vue_js.menu_helpers import (get_node_route, get_node_url_name, get_url_name,
+                                               is_request_dependent_route)
+from djangocms_spa_vue_js.router_helpers import (TemplateRouteMetadata, get_apphooks_with_root_url,
+                                                 get_template_route_metadata)
+from djangocms_spa_vue_js.timing_helpers import timing_span
+
+
+@dataclass
+class RouterCMSPageParts:
+    """
+    The language independent parts of the route of a page, shared by its `RouterCMSPage` instances of all languages.
+    The parts that are resolved through the URL of the page are set by the first language that builds the route.
+    """
+    component: str
+    has_apphook_with_root_url: bool
+    template_route_metadata: TemplateRouteMetadata = None  # of the template of the node (see `get_node_template_name`)
+    apphook_view: object = None
 
 
 @dataclass
 class RouterCMSPage:
     pk: int
+    title_id: int  # the title in the requested language or its fallback language
     template: str
     reverse_id: str
     application_urls: str
     title_path: str
     title_slug: str
+    parts: RouterCMSPageParts
+
+
+def get_router_cms_pages(page_ids, language, site_id):
+    """
+    Returns a dict of `RouterCMSPage` instances for the given page ids (`{page_id: router_cms_page}`). The titles are
+    taken in the given language or its fallback languages. All pages are loaded with one query, inherited templates
+    with at most one more query, independent from the number of pages.
+    """
+    if not page_ids:
+        return {}
+
+    titles = Title.objects.filter(page_id__in=page_ids)
+    return get_router_cms_pages_for_languages(titles=titles, languages=[language], site_id=site_id)[language]
+
+
+def get_router_cms_pages_for_languages(titles, languages, site_id):
+    """
+    Returns the `RouterCMSPage` instances of the pages of the given titles for each language
+    (`{language: {page_id: router_cms_page}}`). The titles of all languages are loaded with one query, the templates
+    (including the inherited templates of the ancestors), the template metadata and the apphooks of the pages are
+    resolved once and shared by all languages (see `RouterCMSPageParts`).
+    """
+    fallback_languages = {
+        language: [language] + get_fallback_languages(language, site_id=site_id) for language in languages
+    }
+    title_rows = titles.filter(language__in={
+        fallback_language for candidates in fallback_languages.values() for fallback_language in candidates
+    }).values(
+        'id', 'language', 'path', 'slug', 'page_id', 'page__template', 'page__reverse_id', 'page__application_urls',
+        'page__publisher_is_draft', 'page__node__path'
+    )
+    title_rows_by_page = {}
+    for title_row in title_rows:
+        title_rows_by_page.setdefault(title_row['page_id'], []).append(title_row)
+
+    # The template, reverse id and apphook are the same in all languages.
+    templates = get_templates_of_page_rows([page_title_rows[0] for page_title_rows in title_rows_by_page.values()])
+    apphooks_with_root_url = get_apphooks_with_root_url()
+    page_parts = {
+        page_id: RouterCMSPageParts(
+            component=get_template_route_metadata(templates[page_id]).component,
+            has_apphook_with_root_url=page_title_rows[0]['page__application_urls'] in apphooks_with_root_url
+        ) for page_id, page_title_rows in title_rows_by_page.items()
+    }
+
+    router_cms_pages = {}
+    for language, candidates in fallback_languages.items():
+        # Pick the title of the best matching language for each page.
+        page_rows = {}
+        for page_id, page_title_rows in title_rows_by_page.items():
+            matching_rows = [title_row for title_row in page_title_rows if title_row['language'] in candidates]
+            if matching_rows:
+                page_rows[page_id] = min(matching_rows, key=lambda title_row: candidates.index(title_row['language']))
+
+        router_cms_pages[language] = {
+            page_id: RouterCMSPage(
+                pk=page_id,
+                title_id=page_row['id'],
+                template=templates[page_id],
+                reverse_id=page_row['page__reverse_id'],
+                application_urls=page_row['page__application_urls'],
+                title_path=page_row['path'],
+                title_slug=page_row['slug'],
+                parts=page_parts[page_id]
+            ) for page_id, page_row in page_rows.items()
+        }
+
+    return router_cms_pages
+
+
+def prefetch_router_cms_pages(request, renderer, languages):
+    """
+    Loads the `RouterCMSPage` instances of all pages of the site of the renderer for the given languages at once. The
+    menu modifier takes them from the request instead of loading them per language.
+    """
+    titles = Title.objects.filter(page__node__site_id=renderer.site.pk,
+                                  page__publisher_is_draft=renderer.draft_mode_active)
+    router_cms_pages = get_router_cms_pages_for_languages(titles=titles, languages=languages, site_id=renderer.site.pk)
+    prefetched_router_cms_pages = request.__dict__.setdefault('_vue_js_router_cms_pages', {})
+    for language, pages in router_cms_pages.items():
+        prefetched_router_cms_pages[(renderer.site.pk, renderer.draft_mode_active, language)] = pages
+
+
+def get_prefetched_router_cms_pages(request, renderer, language):
+    prefetched_router_cms_pages = request.__dict__.get('_vue_js_router_cms_pages', {})
+    return prefetched_router_cms_pages.get((renderer.site.pk, renderer.draft_mode_active, language))
+
+
+def get_templates_of_page_rows(page_rows):
+    """
+    Returns the template of each page row (`{page_id: template}`) like `Page.get_template` does, but resolves the
+    inherited templates of all pages in bulk.
+    """
+    default_template = get_cms_setting('TEMPLATES')[0][0]
+    templates_by_node_path = {
+        (page_row['page__node__path'], page_row['page__publisher_is_draft']): page_row['page__template']
+        for page_row in page_rows
+    }
+
+    # Load the templates of the ancestors that are not part of the page rows.
+    missing_ancestor_paths = set()
+    for page_row in page_rows:
+        if page_row['page__template'] == TEMPLATE_INHERITANCE_MAGIC:
+            missing_ancestor_paths.update(
+                (ancestor_path, page_row['page__publisher_is_draft'])
+                for ancestor_path in get_ancestor_node_paths(page_row['page__node__path'])
+                if (ancestor_path, page_row['page__publisher_is_draft']) not in templates_by_node_path
+            )
+
+    if missing_ancestor_paths:
+        ancestor_pages = Page.objects.filter(node__path__in={path for path, is_draft in missing_ancestor_paths})
+        ancestor_templates = ancestor_pages.values_list('node__path', 'publisher_is_draft', 'template')
+        for node_path, is_draft, template in ancestor_templates:
+            templates_by_node_path[(node_path, is_draft)] = template
+
+    templates = {}
+    for page_row in page_rows:
+        template = page_row['page__template']
+        if template == TEMPLATE_INHERITANCE_MAGIC:
+            # Use the template of the closest ancestor that doesn't inherit its template.
+            ancestor_templates = [
+                templates_by_node_path.get((ancestor_path, page_row['page__publisher_is_draft']))
+                for ancestor_path in reversed(get_ancestor_node_paths(page_row['page__node__path']))
+            ]
+            template = next((t for t in ancestor_templates if t and t != TEMPLATE_INHERITANCE_MAGIC), None)
+        templates[page_row['page_id']] = template or default_template
+
+    return templates
+
+
+def get_ancestor_node_paths(node_path):
+    return [node_path[0:position] for position in range(0, len(node_path), TreeNode.steplen)[1:]]
 
 
 class VueJsMenuModifier(Modifier):
@@ -45,60 +204,165 @@ class VueJsMenuModifier(Modifier):
         else:
             self.renderer.vue_js_structure_started = True
 
+        with timing_span(request, 'vue_js_menu'):
+            return self.get_router_nodes(request=request, nodes=nodes)
+
+    def get_router_nodes(self, request, nodes):
         router_nodes = []
         named_route_path_patterns = {}
 
-        page_nodes = {n.id: n for n in nodes if n.attr['is_page']}
-        pages = Page.objects.filter(id__in=page_nodes.keys()).prefetch_related('title_set')
-        router_pages = {
-            page.pk: RouterCMSPage(
-                pk=page.pk,
-                template=page.get_template(),
-                reverse_id=page.reverse_id,
-                application_urls=page.application_urls,
-                title_path=page.title_set.first().path,
-                title_slug=page.title_set.first().slug
-            ) for page in pages
-        }
+        # The routes of all nodes that don't depend on the request are cached. Only the routes of the selected node
+        # (and the routes that match the requested URL) are built on each request. Routes are invalidated by changes
+        # after this time.
+        built_at = time.time()
+        route_skeleton = get_route_skeleton(request=request, renderer=self.renderer)
+        new_route_entries = []
+        request_url_name = get_url_name(request.path, request=request)
 
+        visible_nodes = []
+        processed_named_route_path_patterns = set()
         for node in nodes:
             if node.attr.get('login_required') and not request.user.is_authenticated:
                 continue
 
-            if node.attr.get('is_page'):
-                node.attr['router_page'] = router_pages.get(node.id)
-
-            node_route = get_node_route(request=request, node=node, renderer=self.renderer)
-
             named_route_path_pattern = node.attr.get('named_route_path_pattern')
             if named_route_path_pattern:
-                named_route_path = node.attr.get('named_route_path')
-                if named_route_path:
-                    path = named_route_path
-                else:
-                    # Override the path with the pattern (e.g. 'parent/foo' to 'parent/:my_path_pattern')
-                    path = '{parent_url}{path_pattern}/'.format(parent_url=node.parent.get_absolute_url(),
-                                                                path_pattern=named_route_path_pattern)
-                node_route['path'] = path
-                node_route['name'] = slugify(path)  # Use the same name for all nodes of this route.
-
-                if named_route_path_pattern not in named_route_path_patterns.keys():
-                    # Store the index of this route in a dict of patterns. We need this to be able to override the
-                    # named route with the selected node (see the next condition).
-                    named_route_path_patterns[named_route_path_pattern] = len(router_nodes)
-                elif node.selected:
-                    # Update the router config with the fetched data of the selected node.
-                    index_of_first_named_route = named_route_path_patterns[named_route_path_pattern]
-                    node.attr['vue_js_route'] = node_route
-                    router_nodes[index_of_first_named_route] = node
-                    continue  # Skip this iteration, we don't need to add a named route twice.
-                else:
+                if named_route_path_pattern in processed_named_route_path_patterns and not node.selected:
                     continue  # Ignore named routes for path patterns that have already been processed.
+                processed_named_route_path_patterns.add(named_route_path_pattern)
+
+            visible_nodes.append(node)
+
+        route_entries, nodes_to_build, stale_nodes = self.get_cached_route_entries(
+            request=request, nodes=visible_nodes, route_skeleton=route_skeleton, request_url_name=request_url_name
+        )
+
+        # Missing and stale routes are rebuilt by one request at a time. All other requests serve the stale routes
+        # until they are replaced and wait for the missing routes instead of building them as well. Routes checked
+        # against a newer invalidation generation are written back by one request, too.
+        has_route_skeleton_lock = False
+        if route_skeleton is not None:
+            has_missing_routes = self.has_missing_routes(request, nodes_to_build, request_url_name)
+            if has_missing_routes or stale_nodes or route_skeleton.is_outdated:
+                has_route_skeleton_lock = acquire_route_skeleton_lock(request, self.renderer)
 
-            node.attr['vue_js_route'] = node_route
-            router_nodes.append(node)
+            if has_missing_routes and not has_route_skeleton_lock:
+                wait_for_route_skeleton_lock(request, self.renderer)
+                route_skeleton = get_route_skeleton(request=request, renderer=self.renderer)
+                route_entries, nodes_to_build, stale_nodes = self.get_cached_route_entries(
+                    request=request, nodes=visible_nodes, route_skeleton=route_skeleton,
+                    request_url_name=request_url_name
+                )
+                if self.has_missing_routes(request, nodes_to_build, request_url_name):
+                    # The other request failed to cache the routes, try to take over.
+                    has_route_skeleton_lock = acquire_route_skeleton_lock(request, self.renderer)
+
+        # The lock is released even if a route can't be built, other requests would wait for it until it expires.
+        try:
+            has_invalidated_routes = any(is_invalidated_route_entry(route_entries[node]) for node in stale_nodes)
+            if has_route_skeleton_lock:
+                for node in stale_nodes:
+                    del route_entries[node]
+                    nodes_to_build.append(node)
+            elif has_invalidated_routes:
+                # This response contains invalidated routes, it must not be cached.
+                disable_response_caches(request)
+
+            router_pages = self.get_router_pages(request=request, nodes=nodes_to_build)
+
+            for node in visible_nodes:
+                if node in route_entries:
+                    node_route = route_entries[node]['route']
+                else:
+                    if node.attr.get('is_page'):
+                        node.attr['router_page'] = router_pages.get(node.id)
+
+                    with timing_span(request, 'vue_js_routes'):
+                        node_route = get_node_route(request=request, node=node, renderer=self.renderer)
+
+                    route_entry = get_route_entry(
+                        node=node,
+                        node_route=node_route,
+                        built_at=built_at,
+                        url_name=None if node.attr.get('is_page') else get_node_url_name(node, request=request)
+                    )
+                    is_shared_route = not is_request_dependent_route(request, node, request_url_name, route_entry)
+                    if route_skeleton is not None and is_shared_route:
+                        route_skeleton.routes[get_node_key(node)] = route_entry
+                        new_route_entries.append(route_entry)
+
+                named_route_path_pattern = node.attr.get('named_route_path_pattern')
+                if named_route_path_pattern:
+                    named_route_path = node.attr.get('named_route_path')
+                    if named_route_path:
+                        path = named_route_path
+                    else:
+                        # Override the path with the pattern (e.g. 'parent/foo' to 'parent/:my_path_pattern')
+                        path = '{parent_url}{path_pattern}/'.format(parent_url=node.parent.get_absolute_url(),
+                                                                    path_pattern=named_route_path_pattern)
+                    node_route.path = path
+                    node_route.name = slugify(path)  # Use the same name for all nodes of this route.
+
+                    if named_route_path_pattern not in named_route_path_patterns.keys():
+                        # Store the index of this route in a dict of patterns. We need this to be able to override the
+                        # named route with the selected node (see the next condition).
+                        named_route_path_patterns[named_route_path_pattern] = len(router_nodes)
+                    else:
+                        # Update the router config with the fetched data of the selected node. Named routes of nodes
+                        # that are not selected have been skipped above.
+                        index_of_first_named_route = named_route_path_patterns[named_route_path_pattern]
+                        node.attr['vue_js_route'] = node_route
+                        router_nodes[index_of_first_named_route] = node
+                        continue  # Skip this iteration, we don't need to add a named route twice.
+
+                node.attr['vue_js_route'] = node_route
+                router_nodes.append(node)
+
+            if has_route_skeleton_lock:
+                # Encode the final routes (including the named route paths) once, the router JSON reuses them.
+                for route_entry in new_route_entries:
+                    route_dict = route_entry['route'].to_dict()
+                    route_entry['route'].json = dumps(route_dict)
+                    route_entry['route'].compact_fragment = get_compact_route_fragment(route_dict)
+                set_route_skeleton(request=request, renderer=self.renderer, route_skeleton=route_skeleton)
+                if has_invalidated_routes:
+                    # Responses cached with the routes that have been replaced (e.g. router views) become invalid.
+                    update_router_version()
+        finally:
+            if has_route_skeleton_lock:
+                release_route_skeleton_lock(request, self.renderer)
 
         return router_nodes
 
+    def get_cached_route_entries(self, request, nodes, route_skeleton, request_url_name):
+        """
+        Returns the cached route entries of the nodes (`{node: route_entry}`), the nodes whose routes have to be built
+        and the nodes whose cached routes are stale.
+        """
+        route_entries = {}
+        nodes_to_build = []
+        stale_nodes = []
+        for node in nodes:
+            route_entry = route_skeleton.routes.get(get_node_key(node)) if route_skeleton is not None else None
+            is_valid_route_entry = route_entry and route_entry['url'] == node.get_absolute_url()
+            if is_valid_route_entry and not is_request_dependent_route(request, node, request_url_name, route_entry):
+                route_entries[node] = route_entry
+                if is_stale_route_entry(route_entry):
+                    stale_nodes.append(node)
+            else:
+                nodes_to_build.append(node)
+        return route_entries, nodes_to_build, stale_nodes
+
+    def has_missing_routes(self, request, nodes_to_build, request_url_name):
+        # The routes that depend on the request are built by every request, they are never cached.
+        return any(not is_request_dependent_route(request, node, request_url_name) for node in nodes_to_build)
+
+    def get_router_pages(self, request, nodes):
+        page_ids = [node.id for node in nodes if node.attr.get('is_page')]
+        prefetched_pages = get_prefetched_router_cms_pages(request, self.renderer, language=request.LANGUAGE_CODE)
+        if prefetched_pages is not None:
+            return {page_id: prefetched_pages[page_id] for page_id in page_ids if page_id in prefetched_pages}
+        return get_router_cms_pages(page_ids=page_ids, language=request.LANGUAGE_CODE, site_id=self.renderer.site.pk)
+
 
 menu_pool.register_modifier(VueJsMenuModifier)
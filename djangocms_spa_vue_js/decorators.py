@@ -0,0 +1,51 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.response import ContentNotRenderedError
+from djangocms_spa.decorators import set_cache_after_rendering
+
+from .cache_helpers import get_router_cache_variant, is_response_cache_disabled, is_shared_router_cache_variant
+
+
+def cache_view_per_variant(view_func):
+    """
+    Caches the responses of a view like `djangocms_spa.decorators.cache_view`, but for all users of a shared visibility
+    variant instead of anonymous users only. The variant is added to the cache key of the view (or its URL, if the view
+    has no cache key).
+    """
+    @wraps(view_func)
+    def _wrapped_view_func(view, *args, **kwargs):
+        request = view.request
+        variant = get_router_cache_variant(request)
+        if not is_shared_router_cache_variant(variant):
+            return view_func(view, *args, **kwargs)
+
+        cache_key = view.get_cache_key()
+        if not cache_key:
+            cache_key = request.get_full_path()
+
+        cache_key += ':%s' % variant
+        if view.add_language_code:
+            cache_key += ':%s' % getattr(request, 'LANGUAGE_CODE', settings.LANGUAGE_CODE)
+
+        cached_response = cache.get(cache_key)
+        if cached_response:
+            return cached_response
+
+        response = view_func(view, *args, **kwargs)
+
+        def set_cache(response):
+            # The router may be built while rendering, e.g. with invalidated routes (see `disable_response_caches`).
+            if not is_response_cache_disabled(request):
+                set_cache_after_rendering(cache_key, response, settings.DJANGOCMS_SPA_CACHE_TIMEOUT)
+
+        if response.status_code == 200:
+            try:
+                set_cache(response)
+            except ContentNotRenderedError:
+                response.add_post_render_callback(set_cache)
+
+        return response
+
+    return _wrapped_view_func
@@ -0,0 +1,191 @@
+import json
+import re
+
+from django.conf import settings
+
+COMPACT_ROUTER_FORMAT = 'compact-1'
+COMPACT_REFERENCE_PLACEHOLDER = '918273645%d918273645'  # an integer, replaced by the index of a table entry
+COMPACT_REFERENCE_PATTERN = re.compile(r'918273645(\d+)918273645')
+
+
+class SerializedRoute(dict):
+    """
+    A route that carries its already encoded JSON and its compact JSON fragment (see `get_compact_route_fragment`).
+    These routes are built from the cached route skeleton and must not be modified, otherwise the JSON is outdated.
+    """
+    __slots__ = ('json', 'compact_fragment')
+
+    def __init__(self, route, route_json, compact_fragment=None):
+        super(SerializedRoute, self).__init__(route)
+        self.json = route_json
+        self.compact_fragment = compact_fragment
+
+
+def dumps(data):
+    return json.dumps(data, cls=settings.DJANGOCMS_SPA_JSON_ENCODER)
+
+
+def get_route_json(route):
+    if isinstance(route, SerializedRoute):
+        return route.json
+    return dumps(route)
+
+
+def get_routes_json(routes):
+    return '[%s]' % ', '.join([get_route_json(route) for route in routes])
+
+
+def get_vue_js_router_json(router):
+    """
+    Returns the same JSON as `json.dumps(router)` but reuses the encoded JSON of all serialized routes. Only routes
+    that depend on the request (e.g. the active route) are encoded. Returns the compact format (see
+    `get_compact_vue_js_router_json`) if `DJANGOCMS_SPA_VUE_JS_COMPACT_ROUTER` is set.
+    """
+    if settings.DJANGOCMS_SPA_VUE_JS_COMPACT_ROUTER:
+        return get_compact_vue_js_router_json(router)
+
+    return get_regular_vue_js_router_json(router)
+
+
+def get_regular_vue_js_router_json(router):
+    router_json_items = []
+    for key, value in router.items():
+        if key == 'routes':
+            value_json = get_routes_json(value)
+        else:
+            value_json = dumps(value)
+        router_json_items.append('%s: %s' % (dumps(key), value_json))
+
+    return '{%s}' % ', '.join(router_json_items)
+
+
+def compact_dumps(data):
+    return json.dumps(data, cls=settings.DJANGOCMS_SPA_JSON_ENCODER, separators=(',', ':'))
+
+
+def get_compact_vue_js_router_json(router):
+    """
+    Returns the router in the compact format. Component names, fetch URL prefixes and queries are stored once in the
+    `strings` and `queries` tables, the routes reference them by index and use short keys. See the README for the
+    decoder of the frontend. The routes reuse their cached compact fragments, only the table indexes are filled in
+    and only routes that depend on the request (e.g. the active route) are encoded.
+    """
+    tables = CompactRouterTables()
+    router_json_items = []
+    for key, value in router.items():
+        if key == 'routes':
+            value_json = '[%s]' % ','.join([get_compact_route_json(route, tables) for route in value])
+        else:
+            value_json = compact_dumps(value)
+        router_json_items.append('%s:%s' % (compact_dumps(key), value_json))
+
+    router_json_items += [
+        '"format":%s' % compact_dumps(COMPACT_ROUTER_FORMAT),
+        '"strings":%s' % compact_dumps(tables.strings),
+        '"queries":[%s]' % ','.join(tables.queries),
+    ]
+    return '{%s}' % ','.join(router_json_items)
+
+
+class CompactRouterTables(object):
+    """
+    The tables of the compact router. Every string and query is stored once and referenced by its index, the queries
+    are stored as JSON.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self.string_indexes = {}
+        self.queries = []
+        self.query_indexes = {}
+
+    def get_string_index(self, string):
+        if string not in self.string_indexes:
+            self.string_indexes[string] = len(self.strings)
+            self.strings.append(string)
+        return self.string_indexes[string]
+
+    def get_query_index(self, query_json):
+        if query_json not in self.query_indexes:
+            self.query_indexes[query_json] = len(self.queries)
+            self.queries.append(query_json)
+        return self.query_indexes[query_json]
+
+
+class CompactRouteReferences(object):
+    """
+    Records the table entries of a single route. The route references them by placeholders, which are replaced by the
+    indexes of the router tables (see `get_compact_route_json`).
+    """
+
+    def __init__(self):
+        self.references = []
+
+    def add_reference(self, table, value):
+        self.references.append((table, value))
+        return int(COMPACT_REFERENCE_PLACEHOLDER % (len(self.references) - 1))
+
+    def get_string_index(self, string):
+        return self.add_reference('string', string)
+
+    def get_query_index(self, query_json):
+        return self.add_reference('query', query_json)
+
+
+def get_compact_route_fragment(route):
+    """
+    Returns the compact JSON of a route as fragment that doesn't depend on the router tables: the JSON parts between
+    the references and the references (table and value). The fragments of cached routes are encoded once.
+    """
+    route_references = CompactRouteReferences()
+    parts = COMPACT_REFERENCE_PATTERN.split(compact_dumps(get_compact_route(route, route_references)))
+    references = tuple(route_references.references[int(index)] for index in parts[1::2])
+    return tuple(parts[::2]), references
+
+
+def get_compact_route_json(route, tables):
+    compact_fragment = getattr(route, 'compact_fragment', None) or get_compact_route_fragment(route)
+    parts, references = compact_fragment
+    route_json_parts = [parts[0]]
+    for (table, value), part in zip(references, parts[1:]):
+        if table == 'string':
+            index = tables.get_string_index(value)
+        else:
+            index = tables.get_query_index(value)
+        route_json_parts.append(str(index))
+        route_json_parts.append(part)
+    return ''.join(route_json_parts)
+
+
+def get_compact_route(route, tables):
+    compact_route = {
+        'p': route['path'],
+        'n': route.get('name'),
+    }
+
+    if 'component' in route:
+        compact_route['c'] = tables.get_string_index(route['component'])
+    if 'redirect' in route:
+        compact_route['r'] = route['redirect']
+    if 'params' in route:
+        compact_route['a'] = route['params']
+    if 'meta' in route:
+        compact_route['m'] = route['meta']['id']
+
+    if 'api' in route:
+        fetch = route['api']['fetch']
+        fetch_url = fetch['url']
+        if fetch_url:
+            # Siblings share the prefix of their fetch URL (e.g. `/api/pages/parent/`).
+            prefix, separator, suffix = fetch_url.rstrip('/').rpartition('/')
+            compact_route['f'] = [tables.get_string_index(prefix + separator), fetch_url[len(prefix + separator):]]
+        else:
+            compact_route['f'] = None
+        if fetch.get('useCache') is False:
+            compact_route['u'] = 0
+        if 'query' in fetch:
+            compact_route['q'] = tables.get_query_index(compact_dumps(fetch['query']))
+        if 'fetched' in route['api']:
+            compact_route['d'] = route['api']['fetched']
+
+    return compact_route
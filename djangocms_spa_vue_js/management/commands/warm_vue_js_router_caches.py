@@ -0,0 +1,63 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from ...cache_helpers import is_editor
+from ...warmup_helpers import CACHE_WARMUP_STAGES, get_cache_warmup_tasks, init_cache_warmup_process, warm_caches
+
+
+class Command(BaseCommand):
+    help = (
+        'Builds the routers and the partials of each combination of site, permission variant and language to fill '
+        'their caches (e.g. after a deploy). Use a cache backend that is shared by all processes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sites', nargs='+', type=int, help='IDs of the sites, defaults to all sites.')
+        parser.add_argument('--languages', nargs='+', help='Language codes, defaults to all languages.')
+        parser.add_argument('--user', dest='usernames', action='append', default=[], metavar='USERNAME',
+                            help='Also warm up the permission variant of this user (repeatable).')
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                            help='Number of worker processes, 1 warms up the caches in this process.')
+        parser.add_argument('--manifest-root', metavar='PATH',
+                            help='Write the router manifests of anonymous users to PATH/<site id>/<language>/.')
+
+    def handle(self, *args, **options):
+        for username in options['usernames']:
+            try:
+                user = get_user_model().objects.get_by_natural_key(username)
+            except get_user_model().DoesNotExist:
+                raise CommandError('User "%s" does not exist.' % username)
+            if is_editor(user):
+                raise CommandError('User "%s" is an editor, the routers of editors are never cached.' % username)
+
+        # The worker processes warm up the languages in parallel, a single process builds them together.
+        tasks = get_cache_warmup_tasks(
+            site_ids=options['sites'],
+            languages=options['languages'],
+            usernames=options['usernames'],
+            per_language=options['processes'] > 1
+        )
+        processes = min(options['processes'], len(tasks))
+        started = time.perf_counter()
+
+        if processes > 1:
+            # The workers open their own database connections.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=processes, initializer=init_cache_warmup_process) as pool:
+                results = list(pool.map(warm_caches, tasks, [options['manifest_root']] * len(tasks)))
+        else:
+            results = [warm_caches(task, manifest_root=options['manifest_root']) for task in tasks]
+
+        stage_columns = ''.join(' %10s' % ('%s ms' % stage) for stage in CACHE_WARMUP_STAGES)
+        self.stdout.write('%6s %-14s %-14s%s' % ('site', 'languages', 'variant', stage_columns))
+        for task, variant, durations in results:
+            self.stdout.write('%6d %-14s %-14s' % (task.site_id, ','.join(task.languages), variant) + ''.join(
+                ' %10.2f' % (durations[stage] * 1000) if stage in durations else ' %10s' % '-'
+                for stage in CACHE_WARMUP_STAGES
+            ))
+        self.stdout.write('Warmed up %d combinations in %.2f s.' % (len(results), time.perf_counter() - started))
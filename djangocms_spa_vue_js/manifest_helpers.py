@@ -0,0 +1,207 @@
+import gzip
+import hashlib
+from collections import namedtuple
+
+from cms.utils.conf import get_cms_setting
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import translation
+
+from .cache_helpers import (get_router_cache_variant, get_router_state, is_route_skeleton_cache_active,
+                            is_shared_router_cache_variant, wait_for_cache_lock)
+from .cms_menus import prefetch_router_cms_pages
+from .json_helpers import dumps, get_vue_js_router_json
+from .menu_helpers import get_menu_nodes_for_language, get_menu_renderer, get_vue_js_routes
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+RouterManifest = namedtuple('RouterManifest', ['version', 'content'])
+
+
+def get_vue_js_router_manifest(request, language):
+    """
+    Returns the manifest of the router of the given language. The version of the manifest is a hash of its routes.
+    """
+    menu_nodes = get_menu_nodes_for_language(request=request, language=language)
+    return get_router_manifest(get_vue_js_routes(menu_nodes))
+
+
+def get_router_manifest(routes):
+    router_json = get_vue_js_router_json({'routes': routes})
+    version = hashlib.sha1(router_json.encode('utf-8')).hexdigest()[:16]
+    content = '{"version": %s, %s' % (dumps(version), router_json[1:])
+    return RouterManifest(version=version, content=content.encode('utf-8'))
+
+
+def get_vue_js_routes_for_languages(request, languages):
+    """
+    Returns the routes of each of the given languages (`{language: routes}`), independent of the requested URL. The
+    pages of all languages are loaded with one query up front and share their language independent parts (see
+    `get_router_cms_pages_for_languages`). The menu is built per language and adds the titles, URLs and names.
+    """
+    prefetch_router_cms_pages(request, get_menu_renderer(request=request), languages=languages)
+
+    request_language = getattr(request, 'LANGUAGE_CODE', None)
+    routes = {}
+    try:
+        for language in languages:
+            with translation.override(language):
+                request.LANGUAGE_CODE = language
+                routes[language] = get_vue_js_routes(get_menu_nodes_for_language(request=request, language=language))
+    finally:
+        request.LANGUAGE_CODE = request_language
+    return routes
+
+
+def get_vue_js_router_manifests(request, languages):
+    """
+    Returns the manifests of the routers of the given languages (`{language: manifest}`), built together (see
+    `get_vue_js_routes_for_languages`).
+    """
+    return {
+        language: get_router_manifest(routes)
+        for language, routes in get_vue_js_routes_for_languages(request=request, languages=languages).items()
+    }
+
+
+def get_router_manifest_cache_key(router_version, site_id, variant, language):
+    return '{prefix}vue_js_router_manifest_{router_version}_{site_id}_{variant}_{language}'.format(
+        prefix=get_cms_setting('CACHE_PREFIX'),
+        router_version=router_version,
+        site_id=site_id,
+        variant=variant,
+        language=language
+    )
+
+
+def get_router_manifest_lock_cache_key(request, renderer):
+    return '{prefix}vue_js_router_manifest_lock_{router_version}_{site_id}_{variant}'.format(
+        prefix=get_cms_setting('CACHE_PREFIX'),
+        router_version=get_router_state(renderer.site.pk),
+        site_id=renderer.site.pk,
+        variant=get_router_cache_variant(request)
+    )
+
+
+def is_router_manifest_cache_active(request, renderer):
+    variant = get_router_cache_variant(request)
+    return is_route_skeleton_cache_active(renderer) and is_shared_router_cache_variant(variant)
+
+
+def get_router_manifest_cache_keys(request, renderer, languages):
+    router_version = get_router_state(renderer.site.pk)
+    variant = get_router_cache_variant(request)
+    return {
+        language: get_router_manifest_cache_key(router_version=router_version, site_id=renderer.site.pk,
+                                                variant=variant, language=language)
+        for language in languages
+    }
+
+
+def get_cached_vue_js_router_manifest(request, language):
+    """
+    Returns the manifest of the router of the given language from the cache. On a miss, the manifests of all languages
+    are built and cached together, clients usually request the other languages soon after. They are built by a single
+    request that holds a lock in the cache, concurrent requests wait for them. The cache is only used for shared
+    visibility variants and is validated by the router state (see `get_router_state`).
+    """
+    renderer = get_menu_renderer(request=request)
+    if not is_router_manifest_cache_active(request, renderer):
+        return get_vue_js_router_manifest(request=request, language=language)
+
+    cache_key = get_router_manifest_cache_keys(request, renderer, languages=[language])[language]
+    manifest = cache.get(cache_key)
+    if manifest is not None:
+        return RouterManifest(*manifest)
+
+    lock_cache_key = get_router_manifest_lock_cache_key(request, renderer)
+    if not cache.add(lock_cache_key, True, settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_LOCK_TIMEOUT):
+        wait_for_cache_lock(lock_cache_key)
+        manifest = cache.get(cache_key)
+        if manifest is not None:
+            return RouterManifest(*manifest)
+        # The lock expired before the manifests were cached, only the requested language is built.
+        return get_vue_js_router_manifest(request=request, language=language)
+
+    try:
+        languages = [language_code for language_code, language_name in settings.LANGUAGES]
+        if language not in languages:
+            languages.append(language)
+        manifests = get_vue_js_router_manifests(request=request, languages=languages)
+        set_cached_vue_js_router_manifests(request, renderer, manifests)
+    finally:
+        cache.delete(lock_cache_key)
+    return manifests[language]
+
+
+def get_cached_router_manifest_etag(request):
+    """
+    Returns the weak ETag of the cached manifest of the requested language, or `None` if manifests are not cached for
+    this request. The cached manifests change with the router state, the ETag is known without loading them.
+    """
+    renderer = get_menu_renderer(request=request)
+    if not is_router_manifest_cache_active(request, renderer):
+        return None
+    return 'W/"%s-%s"' % (get_router_state(renderer.site.pk), get_router_cache_variant(request))
+
+
+def set_cached_vue_js_router_manifests(request, renderer, manifests):
+    if not is_router_manifest_cache_active(request, renderer):
+        return
+
+    cache_keys = get_router_manifest_cache_keys(request, renderer, languages=manifests.keys())
+    cache.set_many(
+        {cache_keys[language]: tuple(manifest) for language, manifest in manifests.items()},
+        settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT
+    )
+
+
+def get_accepted_encodings(accept_encoding):
+    accepted_encodings = set()
+    for accepted_encoding in accept_encoding.split(','):
+        encoding, __, params = accepted_encoding.partition(';')
+        quality = 1.0
+        params = params.replace(' ', '')
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                pass
+        if quality > 0:
+            accepted_encodings.add(encoding.strip().lower())
+    return accepted_encodings
+
+
+def get_encoded_manifest_content(manifest, accept_encoding):
+    """
+    Returns the content of the manifest compressed with the best encoding the client accepts and the name of the
+    encoding (`None` if the content is not compressed). Compressed contents are cached by the version of the manifest.
+    """
+    if not settings.DJANGOCMS_SPA_VUE_JS_ROUTER_MANIFEST_COMPRESSION:
+        return manifest.content, None
+
+    accepted_encodings = get_accepted_encodings(accept_encoding)
+    if brotli and 'br' in accepted_encodings:
+        encoding = 'br'
+    elif 'gzip' in accepted_encodings:
+        encoding = 'gzip'
+    else:
+        return manifest.content, None
+
+    cache_key = '{prefix}vue_js_router_manifest_{version}_{encoding}'.format(
+        prefix=get_cms_setting('CACHE_PREFIX'),
+        version=manifest.version,
+        encoding=encoding
+    )
+    content = cache.get(cache_key)
+    if content is None:
+        if encoding == 'br':
+            content = brotli.compress(manifest.content)
+        else:
+            content = gzip.compress(manifest.content)
+        cache.set(cache_key, content, settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT)
+
+    return content, encoding
@@ -1,13 +1,15 @@
-from cms.models import Page
+from cms.models import Title
 from django.conf import settings
-from django.urls import Resolver404, resolve, reverse
 from django.utils.encoding import force_str
-from djangocms_spa.content_helpers import (get_frontend_data_dict_for_cms_page, get_frontend_data_dict_for_partials,
-                                           get_partial_names_for_template)
-from djangocms_spa.utils import get_frontend_component_name_by_template, get_view_from_url
+from djangocms_spa.content_helpers import get_frontend_data_dict_for_cms_page, get_partial_names_for_template
 from menus.menu_pool import menu_pool
 
-from .router_helpers import get_vue_js_router_name_for_cms_page
+from .cache_helpers import get_node_key
+from .partial_helpers import get_frontend_data_dict_for_partials
+from .prefetch_helpers import add_prefetched_route_data
+from .router_helpers import VueJsRoute, get_template_route_metadata, get_vue_js_router_name_for_cms_page
+from .timing_helpers import timing_span
+from .url_helpers import resolve_url, reverse_with_template
 
 
 def get_vue_js_router(context=None, request=None):
@@ -15,7 +17,6 @@ def get_vue_js_router(context=None, request=None):
     Returns a list of all routes (CMS pages, projects, team members, etc.) that are in the menu of django CMS. The list
     contains a dict structure that is used by the Vue JS router.
     """
-    vue_routes = []
     menu_renderer = get_menu_renderer(context=context, request=request)
 
     # For the usage of template tags inside our menu modifier we need to make it available on our menu_renderer.
@@ -23,13 +24,92 @@ def get_vue_js_router(context=None, request=None):
     menu_renderer.set_context(context)
 
     menu_nodes = menu_renderer.get_nodes()
+    request = request or context.get('request')
+    if settings.DJANGOCMS_SPA_VUE_JS_LAZY_ROUTER:
+        vue_js_router = get_lazy_vue_js_router(menu_nodes=menu_nodes, language=request.LANGUAGE_CODE)
+    else:
+        vue_js_router = {'routes': get_vue_js_routes(menu_nodes)}
+
+    # Embed the data of the routes the user likely visits next (see `DJANGOCMS_SPA_VUE_JS_PREFETCH_ROUTES`).
+    add_prefetched_route_data(request=request, menu_nodes=menu_nodes, routes=vue_js_router['routes'])
+    return vue_js_router
+
+
+def get_vue_js_routes(menu_nodes):
+    return [node.attr['vue_js_route'].to_dict() for node in menu_nodes if node.attr.get('vue_js_route')]
+
+
+def get_lazy_vue_js_router(menu_nodes, language):
+    """
+    Returns the routes of the top levels of the menu (see `DJANGOCMS_SPA_VUE_JS_LAZY_ROUTER_DEPTH`), the active route
+    and its ancestors. The routes of all other nodes are grouped by their subtree into chunks. The frontend loads the
+    routes of a chunk from its `fetch` URL as soon as it navigates to a path of this chunk.
+    """
+    lazy_router_depth = settings.DJANGOCMS_SPA_VUE_JS_LAZY_ROUTER_DEPTH
+
+    active_nodes = set()
+    for node in menu_nodes:
+        route = node.attr.get('vue_js_route')
+        if route and route.is_active:
+            active_nodes.add(node)
+            active_nodes.update(node.get_ancestors())
+
+    vue_routes = []
+    chunk_nodes = {}
     for node in menu_nodes:
-        if node.attr.get('vue_js_route'):
-            vue_routes.append(node.attr.get('vue_js_route'))
+        route = node.attr.get('vue_js_route')
+        if not route:
+            continue
+
+        ancestors = node.get_ancestors()
+        if len(ancestors) < lazy_router_depth or node in active_nodes:
+            vue_routes.append(route.to_dict())
+
+        if len(ancestors) >= lazy_router_depth:
+            # The ancestors are ordered from the parent to the root node.
+            chunk_node = ancestors[len(ancestors) - lazy_router_depth]
+            chunk_nodes.setdefault(get_node_key(chunk_node), chunk_node)
+
+    chunks = []
+    for node_key, chunk_node in chunk_nodes.items():
+        chunk_route = chunk_node.attr.get('vue_js_route')
+        chunks.append({
+            'path': chunk_route.path if chunk_route else chunk_node.get_absolute_url(),
+            'fetch': reverse_with_template('djangocms_spa_vue_js:vue_js_router_chunk',
+                                           kwargs={'language': language, 'subtree': node_key}),
+        })
+
+    return {'routes': vue_routes, 'chunks': chunks}
 
+
+def get_vue_js_router_chunk(request, language, subtree):
+    """
+    Returns the routes of all descendants of the node with the key `subtree` or `None` if there is no such node.
+    """
+    menu_nodes = get_menu_nodes_for_language(request=request, language=language)
+    subtree_node = next((node for node in menu_nodes if get_node_key(node) == subtree), None)
+    if not subtree_node:
+        return None
+
+    descendants = set(subtree_node.get_descendants())
+    vue_routes = [
+        node.attr['vue_js_route'].to_dict() for node in menu_nodes
+        if node in descendants and node.attr.get('vue_js_route')
+    ]
     return {'routes': vue_routes}
 
 
+def get_menu_nodes_for_language(request, language):
+    """
+    Returns the menu nodes (including their routes) of the given language, independent of the requested URL. Used by
+    the API views of the router.
+    """
+    menu_renderer = get_menu_renderer(request=request)
+    menu_renderer.request_language = language
+    menu_renderer.set_context(None)
+    return menu_renderer.get_nodes()
+
+
 def get_menu_renderer(context=None, request=None):
     menu_renderer = None
 
@@ -42,10 +122,16 @@ def get_menu_renderer(context=None, request=None):
     return menu_renderer
 
 
-def get_node_template_name(node):
+def get_node_template_name(node, request=None):
+    if node.attr.get('is_named_route_pattern'):
+        return node.attr.get('template') or settings.DJANGOCMS_SPA_DEFAULT_TEMPLATE
+
+    resolved_url = resolve_url(node.get_absolute_url(), request=request)
+    if not resolved_url:
+        return settings.DJANGOCMS_SPA_VUE_JS_ERROR_404_TEMPLATE
     try:
-        view = get_view_from_url(node.get_absolute_url())
-    except (AttributeError, Resolver404):
+        view = resolved_url.view
+    except (AttributeError, ImportError):
         return settings.DJANGOCMS_SPA_VUE_JS_ERROR_404_TEMPLATE
     if view.__module__ == 'cms.views':
         template = node.attr.get('template')
@@ -63,27 +149,68 @@ def get_node_template_name(node):
             return settings.DJANGOCMS_SPA_DEFAULT_TEMPLATE
 
 
-def get_node_route(request, node, renderer, template=''):
-    # Initial data of the route.
-    route_data = {
-        'api': {},
+def get_url_name(url, request=None):
+    resolved_url = resolve_url(url, request=request)
+    return resolved_url.url_name if resolved_url else None
+
+
+def get_node_url_name(node, request=None):
+    # Named route patterns are not resolvable, they declare the URL name of their detail view.
+    return node.attr.get('url_name') or get_url_name(node.get_absolute_url(), request=request)
+
+
+def get_named_route_node_attributes(component, vue_js_router_name, named_route_path_pattern, fetch_url, url_name,
+                                    template=None):
+    """
+    Returns the attributes of a menu node that represents all detail views of an apphook with one named route (e.g.
+    `news/:slug`). Use it instead of attaching every instance to the menu. The `fetch_url` contains the path pattern
+    (e.g. `/api/news/:slug/`), the `url_name` is the name and `template` the template of the detail view. If the
+    detail view is requested, the route gets the keyword arguments of the requested URL as params.
+    """
+    return {
+        'component': component,
+        'vue_js_router_name': vue_js_router_name,
+        'fetch_url': fetch_url,
+        'named_route_path_pattern': named_route_path_pattern,
+        'url_name': url_name,
+        'template': template,
+        'is_named_route_pattern': True,
     }
 
+
+def is_request_dependent_route(request, node, request_url_name, route_entry=None):
+    """
+    Returns `True` if the route of the node contains data of the current request (e.g. the fetched data of the selected
+    node). These routes can't be taken from the route skeleton.
+    """
+    if node.get_absolute_url() == request.path:
+        return True
+
+    if node.attr.get('is_page') or not request_url_name:
+        return False
+
+    url_name = route_entry['url_name'] if route_entry else get_node_url_name(node, request=request)
+    return url_name == request_url_name
+
+
+def get_node_route(request, node, renderer, template=''):
+    route = VueJsRoute(redirect=node.attr.get('redirect_url'))
+
     if node.attr.get('is_page'):
-        route = get_node_route_for_cms_page(request, node, route_data, node.attr.get('router_page'))
+        get_node_route_for_cms_page(request, node, route, node.attr.get('router_page'))
     else:
-        route = get_node_route_for_app_model(request, node, route_data)
+        get_node_route_for_app_model(request, node, route)
 
     if not node.attr.get('use_cache', True):
-        route['api']['fetch']['useCache'] = False
+        route.use_cache = False
 
     if node.selected and node.get_absolute_url() == request.path:
         if not template:
-            template = get_node_template_name(node)
+            template = get_node_template_name(node, request=request)
 
         # Static CMS placeholders and other global page elements (e.g. menu) go into the `partials` dict.
         partial_names = get_partial_names_for_template(template=template)
-        route['api']['fetched']['response']['partials'] = get_frontend_data_dict_for_partials(
+        route.fetched['response']['partials'] = get_frontend_data_dict_for_partials(
             partials=partial_names,
             request=request,
             editable=request.user.has_perm('cms.edit_static_placeholder'),
@@ -91,78 +218,77 @@ def get_node_route(request, node, renderer, template=''):
         )
 
     # Add query params
-    template_path = get_node_template_name(node)
-    try:
-        partials = settings.DJANGOCMS_SPA_TEMPLATES[template_path]['partials']
-    except KeyError:
-        partials = []
+    partials = get_node_template_route_metadata(node, request=request).partials
     if partials:
-        route_data['api']['fetch'].setdefault('query', {}).update({'partials': partials})
-
-    if node.attr.get('redirect_url'):
-        del route_data['api']
+        route.partials = partials
 
     return route
 
 
-def get_node_route_for_cms_page(request, node, route_data, router_page):
+def get_node_template_route_metadata(node, request=None):
+    """
+    Returns the `TemplateRouteMetadata` of the template of the node (see `get_node_template_name`). The metadata of a
+    page is resolved once and shared by the routes of all languages.
+    """
+    router_page = node.attr.get('router_page') if node.attr.get('is_page') else None
+    if router_page and router_page.parts.template_route_metadata:
+        return router_page.parts.template_route_metadata
+
+    template_route_metadata = get_template_route_metadata(get_node_template_name(node, request=request))
+    if router_page:
+        router_page.parts.template_route_metadata = template_route_metadata
+    return template_route_metadata
+
+
+def get_node_route_for_cms_page(request, node, route, router_page):
     # Set name and component of the route.
-    route_data['name'] = get_vue_js_router_name_for_cms_page(router_page.pk)
+    route.name = get_vue_js_router_name_for_cms_page(router_page.pk)
     if not node.attr.get('redirect_url'):
-        try:
-            component = get_frontend_component_name_by_template(router_page.template)
-        except KeyError:
-            component = settings.DJANGOCMS_SPA_TEMPLATES[settings.DJANGOCMS_SPA_DEFAULT_TEMPLATE][
-                'frontend_component_name']
-        route_data['component'] = component
+        route.component = router_page.parts.component
 
     # Add the link to fetch the data from the API.
-    if router_page.application_urls not in settings.DJANGOCMS_SPA_VUE_JS_APPHOOKS_WITH_ROOT_URL:
+    if not router_page.parts.has_apphook_with_root_url:
         if not router_page.title_path:  # The home page does not have a path
             if hasattr(settings, 'DJANGOCMS_SPA_USE_SERIALIZERS') and settings.DJANGOCMS_SPA_USE_SERIALIZERS:
-                fetch_url = reverse('api:cms_page_detail', kwargs={'path': settings.DJANGOCMS_SPA_HOME_PATH})
+                fetch_url = reverse_with_template('api:cms_page_detail',
+                                                  kwargs={'path': settings.DJANGOCMS_SPA_HOME_PATH})
             else:
-                fetch_url = reverse('api:cms_page_detail_home')
+                fetch_url = reverse_with_template('api:cms_page_detail_home')
         elif node.attr.get('named_route_path_pattern'):
             # Get the fetch_url of the parent node through the path of the parent node
             parent_node_path = router_page.title_path.replace('/%s' % router_page.title_slug, '')
-            fetch_url_of_parent_node = reverse('api:cms_page_detail', kwargs={'path': parent_node_path})
+            fetch_url_of_parent_node = reverse_with_template('api:cms_page_detail', kwargs={'path': parent_node_path})
             fetch_url = '{parent_url}{path_pattern}/'.format(parent_url=fetch_url_of_parent_node,
                                                              path_pattern=node.attr.get('named_route_path_pattern'))
         else:
-            fetch_url = reverse('api:cms_page_detail', kwargs={'path': router_page.title_path})
-
-        # Add redirect url if available.
-        if node.attr.get('redirect_url'):
-            route_data['redirect'] = node.attr['redirect_url']
+            fetch_url = reverse_with_template('api:cms_page_detail', kwargs={'path': router_page.title_path})
 
     else:
-        # Apphooks use a view that has a custom API URL to fetch data from.
-        view = get_view_from_url(node.get_absolute_url())
-        fetch_url = force_str(view().get_fetch_url())
-
-    route_data['api']['fetch'] = {
-        'url': fetch_url,
-    }
+        # Apphooks use a view that has a custom API URL to fetch data from. The view is the same in all languages.
+        if router_page.parts.apphook_view is None:
+            router_page.parts.apphook_view = resolve_url(node.get_absolute_url(), request=request).view
+        fetch_url = force_str(router_page.parts.apphook_view().get_fetch_url())
 
-    if router_page.reverse_id:
-        route_data['meta'] = {
-            'id': router_page.reverse_id
-        }
+    route.fetch_url = fetch_url
+    route.meta_id = router_page.reverse_id
 
     # Add initial data for the selected page.
     if node.selected and node.get_absolute_url() == request.path:
-        cms_page = Page.objects.get(pk=router_page.pk)
-        if hasattr(settings, 'DJANGOCMS_SPA_USE_SERIALIZERS') and settings.DJANGOCMS_SPA_USE_SERIALIZERS:
-            from djangocms_spa.serializers import PageSerializer
-            data = PageSerializer(instance=cms_page).data
-        else:
-            data = get_frontend_data_dict_for_cms_page(
-                cms_page=cms_page,
-                cms_page_title=cms_page.title_set.get(language=request.LANGUAGE_CODE),
-                request=request,
-                editable=request.user.has_perm('cms.change_page')
-            )
+        # Load the page together with the title of the router page (it may be the title of a fallback language), all
+        # other data is already part of the router page.
+        cms_page_title = Title.objects.select_related('page').get(pk=router_page.title_id)
+        cms_page = cms_page_title.page
+        with timing_span(request, 'vue_js_page_data'):
+            if hasattr(settings, 'DJANGOCMS_SPA_USE_SERIALIZERS') and settings.DJANGOCMS_SPA_USE_SERIALIZERS:
+                from djangocms_spa.serializers import PageSerializer
+                data = PageSerializer(instance=cms_page).data
+            else:
+                data = get_frontend_data_dict_for_cms_page(
+                    cms_page=cms_page,
+                    cms_page_title=cms_page_title,
+                    request=request,
+                    editable=request.user.has_perm('cms.change_page')
+                )
 
         fetched_data = {
             'response': {
@@ -177,49 +303,45 @@ def get_node_route_for_cms_page(request, node, route_data, router_page):
                         url_param: router_page.title_slug
                     }
                 })
-        route_data['api']['fetched'] = fetched_data
+        route.fetched = fetched_data
 
     if settings.DJANGOCMS_SPA_VUE_JS_USE_I18N_PATTERNS:
-        route_data['path'] = '/%s/%s' % (request.LANGUAGE_CODE, router_page.title_path)
+        route.path = '/%s/%s' % (request.LANGUAGE_CODE, router_page.title_path)
     else:
-        route_data['path'] = '/%s' % router_page.title_path
+        route.path = '/%s' % router_page.title_path
 
-    return route_data
+    return route
 
 
-def get_node_route_for_app_model(request, node, route_data):
+def get_node_route_for_app_model(request, node, route):
     # Set name and component of the route.
-    route_data['component'] = node.attr.get('component')
-    route_data['name'] = node.attr.get('vue_js_router_name')
+    route.component = node.attr.get('component')
+    route.name = node.attr.get('vue_js_router_name')
 
     # Add the link to fetch the data from the API.
-    route_data['api']['fetch'] = {
-        'url': node.attr.get('fetch_url'),
-    }
+    route.fetch_url = node.attr.get('fetch_url')
 
-    try:
-        request_url_name = resolve(request.path).url_name
-        node_url_name = resolve(node.get_absolute_url()).url_name
-    except Resolver404:
-        resolver_match = False
+    resolved_request_url = resolve_url(request.path, request=request)
+    node_url_name = get_node_url_name(node, request=request)
+    if resolved_request_url and node_url_name:
+        resolver_match = resolved_request_url.url_name == node_url_name
     else:
-        resolver_match = request_url_name == node_url_name
+        resolver_match = False
 
     is_selected_node = request.path == node.get_absolute_url() or resolver_match
     if is_selected_node:
         # We need to prepare the initial structure of the fetched data. The actual data is added by the view.
-        route_data['api']['fetched'] = {
+        route.fetched = {
             'response': {
                 'data': {}
             }
         }
-        route_data['params'] = node.attr.get('url_params', {})
-
-    meta_id = node.attr.get('id')
-    if meta_id:
-        route_data['meta'] = {
-            'id': meta_id
-        }
+        if node.attr.get('is_named_route_pattern'):
+            # The instance is not part of the menu, the params are taken from the requested URL.
+            route.params = dict(resolved_request_url.kwargs) if resolver_match else {}
+        else:
+            route.params = node.attr.get('url_params', {})
 
-    route_data['path'] = node.get_absolute_url()
-    return route_data
+    route.meta_id = node.attr.get('id')
+    route.path = node.get_absolute_url()
+    return route
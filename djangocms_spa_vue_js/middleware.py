@@ -1,6 +1,7 @@
 from django.http import JsonResponse
 
 from djangocms_spa_vue_js.menu_helpers import get_vue_js_router
+from djangocms_spa_vue_js.timing_helpers import get_server_timing_header, get_timings, send_timings
 
 
 class RouterDebuggingMiddleware(object):
@@ -8,8 +9,29 @@ class RouterDebuggingMiddleware(object):
         self.get_response = get_response
 
     def __call__(self, request):
-        if request.user.is_authenticated():
+        if request.user.is_authenticated:
             return self.get_response(request)
         else:
             vue_js_router = get_vue_js_router(request=request)
             return JsonResponse(vue_js_router)
+
+
+class ServerTimingMiddleware(object):
+    """
+    Adds the timings of the router stages as `Server-Timing` header to the response and sends them to the
+    `DJANGOCMS_SPA_VUE_JS_TIMING_CALLBACK`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        # Cached responses are rendered without the stages, they don't need any timing.
+        timings = get_timings(request)
+        if timings:
+            response['Server-Timing'] = get_server_timing_header(timings)
+            send_timings(request, timings)
+
+        return response
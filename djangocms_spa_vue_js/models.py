@@ -1,13 +1,34 @@
 from appconf import AppConf
+from cms.utils.conf import get_cms_setting
+from django.utils.translation import gettext_lazy as _
 from django.views.defaults import ERROR_404_TEMPLATE_NAME
-from djangocms_spa.content_helpers import get_frontend_data_dict_for_placeholders, get_global_placeholder_data
+from djangocms_spa.content_helpers import get_global_placeholder_data
 from djangocms_spa.models import DjangoCmsMixin
 
+from .placeholder_helpers import PluginTree, get_frontend_data_dict_for_placeholders, prefetch_placeholders
+from .url_helpers import reverse_with_template
+
 
 class DjangoCmsSPAVueJSConf(AppConf):
     ERROR_404_TEMPLATE = ERROR_404_TEMPLATE_NAME
     APPHOOKS_WITH_ROOT_URL = []  # list of apphooks that use a custom view on the root url (e.g. "/en/<app_hook_page>/")
     USE_I18N_PATTERNS = False
+    ROUTER_CACHE_TIMEOUT = 60 * 60  # cache timeout of the request independent routes, 0 disables the cache
+    ROUTER_CACHE_SOFT_TIMEOUT = 60 * 10  # cached routes older than this are served while one request rebuilds them
+    ROUTER_CACHE_LOCK_TIMEOUT = 30  # max. number of seconds a request may take to rebuild the stale routes
+    SHARED_ROUTER_VARIANTS = ['anonymous']  # visibility variants whose router view responses are cached and validated
+    RESOLVED_URLS_CACHE_SIZE = 4096  # max. number of URLs with their resolved views kept in memory per process
+    LAZY_ROUTER = False  # deliver the routes of deeper menu levels in chunks (see `get_lazy_vue_js_router`)
+    LAZY_ROUTER_DEPTH = 1  # number of menu levels that are always part of the router
+    ROUTER_CHUNK_MAX_AGE = 60 * 10
+    ROUTER_MANIFEST_MAX_AGE = 60 * 60 * 24 * 365  # max age of the versioned router manifest
+    ROUTER_MANIFEST_COMPRESSION = True  # deliver a gzip (or brotli, if installed) compressed manifest
+    PARTIALS_CACHE_TIMEOUT = 60 * 60  # cache timeout of the rendered static placeholders, 0 disables the cache
+    COMPACT_ROUTER = False  # deliver the router in the compact format (see `get_compact_vue_js_router_json`)
+    TIMING = False  # time the stages of the router (see `ServerTimingMiddleware`)
+    TIMING_CALLBACK = None  # dotted path of a function that gets the name, duration and request of each stage
+    PREFETCH_ROUTES = []  # policies of the routes whose data is embedded in the router (see `get_prefetch_nodes`)
+    PREFETCH_ROUTES_MAX_BYTES = 1024 * 32  # max. size of the embedded data of all prefetched routes
 
 
 class DjangocmsVueJsMixin(DjangoCmsMixin):
@@ -15,6 +36,7 @@ class DjangocmsVueJsMixin(DjangoCmsMixin):
     This mixin prepares the data of a model to be ready for the frontend.
     """
     vue_js_router_component = 'topic-detail'
+    api_detail_url_name = None  # URL name of the detail API view, used by the default `get_api_detail_url`
 
     class Meta:
         abstract = True
@@ -23,6 +45,24 @@ class DjangocmsVueJsMixin(DjangoCmsMixin):
     def vue_js_router_name(self):
         return '%s-%s' % (self._meta.app_label, self._meta.model_name)
 
+    @classmethod
+    def prefetch_placeholder_plugins(cls, instances, language):
+        """
+        Loads the placeholders and the plugins of all instances for `get_frontend_detail_data_dict` with one query for
+        the placeholders, one for the plugins and one per plugin type, independent of the number of instances and
+        placeholder fields.
+        """
+        prefetch_placeholders(instances)
+        placeholders = [
+            placeholder for instance in instances for placeholder in instance.get_vue_js_placeholders() if placeholder
+        ]
+        plugin_tree = PluginTree(placeholders, language=language)
+        for instance in instances:
+            instance._vue_js_plugin_tree = plugin_tree
+
+    def get_vue_js_placeholders(self):
+        return [getattr(self, placeholder_field_name) for placeholder_field_name in self.get_placeholder_field_names()]
+
     def get_frontend_list_data_dict(self, request, editable=False, placeholder_name=''):
         data = {}
 
@@ -40,13 +80,15 @@ class DjangocmsVueJsMixin(DjangoCmsMixin):
     def get_frontend_detail_data_dict(self, request, editable=False):
         data = {}
 
-        # Add all placeholder fields.
-        placeholder_field_names = self.get_placeholder_field_names()
-        placeholders = [getattr(self, placeholder_field_name) for placeholder_field_name in placeholder_field_names]
+        # Add all placeholder fields. Their plugins are loaded at once, unless they are already prefetched or editable.
+        plugin_tree = getattr(self, '_vue_js_plugin_tree', None)
+        if not editable and (plugin_tree is None or plugin_tree.language != request.LANGUAGE_CODE):
+            self.prefetch_placeholder_plugins([self], language=request.LANGUAGE_CODE)
         placeholder_frontend_data_dict = get_frontend_data_dict_for_placeholders(
-            placeholders=placeholders,
+            placeholders=self.get_vue_js_placeholders(),
             request=request,
-            editable=editable
+            editable=editable,
+            plugin_tree=getattr(self, '_vue_js_plugin_tree', None)
         )
         global_placeholder_data_dict = get_global_placeholder_data(placeholder_frontend_data_dict)
         data['containers'] = placeholder_frontend_data_dict
@@ -77,9 +119,51 @@ class DjangocmsVueJsMixin(DjangoCmsMixin):
         return ''
 
     def get_api_detail_url(self):
-        # Override this method in your model.
+        # Override this method in your model or set `api_detail_url_name`.
+        if self.api_detail_url_name:
+            return reverse_with_template(self.api_detail_url_name, kwargs=self.get_api_detail_url_kwargs())
         return ''
 
+    def get_api_detail_url_kwargs(self):
+        return {'pk': self.pk}
+
+    def get_cms_placeholder_json(self, request, placeholder_name):
+        # The same structure as `DjangoCmsMixin.get_cms_placeholder_json`, without reversing each URL per object.
+        def admin_reverse(viewname, args=None):
+            return reverse_with_template('%s:%s' % (get_cms_setting('ADMIN_NAMESPACE'), viewname), args=args)
+
+        return {
+            'cms': [
+                placeholder_name,
+                {
+                    'type': 'generic',
+                    'page_language': request.LANGUAGE_CODE,
+                    'placeholder_id': '',
+                    'plugin_name': '%s %s' % (_('Edit'), self._meta.verbose_name),
+                    'plugin_type': '',
+                    'plugin_id': self.pk,
+                    'plugin_language': '',
+                    'plugin_parent': '',
+                    'plugin_order': '',
+                    'plugin_restriction': [],
+                    'plugin_parent_restriction': [],
+                    'onClose': 'REFRESH_PAGE',
+                    'addPluginHelpTitle': '%s %s' % (_('Add plugin to'), self._meta.verbose_name),
+                    'urls': {
+                        'add_plugin': admin_reverse('cms_page_add_plugin'),
+                        'edit_plugin': '{url}?language={language_code}'.format(
+                            url=reverse_with_template(
+                                'admin:%s_%s_change' % (self._meta.app_label, self._meta.model_name), args=(self.pk,)),
+                            language_code=request.LANGUAGE_CODE
+                        ),
+                        'move_plugin': admin_reverse('cms_page_move_plugin'),
+                        'delete_plugin': admin_reverse('cms_page_delete_plugin', args=(self.pk,)),
+                        'copy_plugin': admin_reverse('cms_page_copy_plugins')
+                    }
+                }
+            ]
+        }
+
     def get_detail_view_component(self):
         # Override this method in your model.
         return ''
@@ -0,0 +1,58 @@
+from cms.utils import get_current_site
+from django.conf import settings
+from django.core.cache import cache
+from djangocms_spa import content_helpers
+
+from .cache_helpers import get_partials_cache_key
+from .timing_helpers import timing_span
+
+
+def get_frontend_data_dict_for_partials(partials, request, editable=False, renderer=None):
+    """
+    Returns the data of the partials like `djangocms_spa.content_helpers.get_frontend_data_dict_for_partials`. The
+    rendered static placeholders are cached per language, site and edit permission. Partials with a custom callback
+    (e.g. the menu) depend on the request and are always rendered.
+    """
+    with timing_span(request, 'vue_js_partials'):
+        return get_partial_data(partials=partials, request=request, editable=editable, renderer=renderer)
+
+
+def get_partial_data(partials, request, editable, renderer):
+    static_placeholder_names = [
+        partial for partial in partials if partial not in settings.DJANGOCMS_SPA_PARTIAL_CALLBACKS.keys()
+    ]
+    custom_callback_partials = [
+        partial for partial in partials if partial in settings.DJANGOCMS_SPA_PARTIAL_CALLBACKS.keys()
+    ]
+
+    if not static_placeholder_names or not is_partials_cache_active(request):
+        return content_helpers.get_frontend_data_dict_for_partials(partials=partials, request=request,
+                                                                   editable=editable, renderer=renderer)
+
+    cache_key = get_partials_cache_key(
+        static_placeholder_names=static_placeholder_names,
+        language=request.LANGUAGE_CODE,
+        site_id=get_current_site().pk,
+        editable=editable
+    )
+    partial_data = cache.get(cache_key)
+    if partial_data is None:
+        partial_data = content_helpers.get_frontend_data_dict_for_partials(partials=static_placeholder_names,
+                                                                           request=request, editable=editable)
+        cache.set(cache_key, partial_data, settings.DJANGOCMS_SPA_VUE_JS_PARTIALS_CACHE_TIMEOUT)
+
+    if custom_callback_partials:
+        partial_data.update(content_helpers.get_frontend_data_dict_for_partials(
+            partials=custom_callback_partials,
+            request=request,
+            editable=editable,
+            renderer=renderer
+        ))
+
+    return partial_data
+
+
+def is_partials_cache_active(request):
+    # Editors see the drafts of the static placeholders in edit mode, we never cache them.
+    edit_mode_active = hasattr(request, 'toolbar') and request.toolbar.edit_mode_active
+    return bool(settings.DJANGOCMS_SPA_VUE_JS_PARTIALS_CACHE_TIMEOUT) and not edit_mode_active
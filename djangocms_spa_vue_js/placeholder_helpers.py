@@ -0,0 +1,156 @@
+from collections import defaultdict
+
+from cms.models import CMSPlugin, Placeholder
+from cms.utils.plugins import downcast_plugins
+from django.conf import settings
+from djangocms_spa import content_helpers
+from djangocms_spa.content_helpers import get_global_placeholder_data, get_language_links
+from djangocms_spa.renderer_pool import renderer_pool
+from djangocms_spa.utils import get_function_by_path
+
+
+class PluginTree(object):
+    """
+    The plugins of a set of placeholders in one language, loaded with one query per plugin type. The plugins of each
+    placeholder and the children of each plugin are ordered like in `djangocms_spa.content_helpers`. Plugins that
+    can't be downcast (e.g. their plugin model instance is missing) are kept as `CMSPlugin` in `missing_plugin_ids`.
+    """
+    __slots__ = ('language', 'plugins_by_placeholder', 'children_by_parent', 'missing_plugin_ids')
+
+    def __init__(self, placeholders, language):
+        self.language = language
+        self.plugins_by_placeholder = defaultdict(list)
+        self.children_by_parent = defaultdict(list)
+
+        plugins = list(CMSPlugin.objects.filter(placeholder__in=placeholders, language=language))
+        instances = {instance.pk: instance for instance in downcast_plugins(plugins, placeholders=placeholders)}
+        self.missing_plugin_ids = {plugin.pk for plugin in plugins if plugin.pk not in instances}
+        parent_field = CMSPlugin._meta.get_field('parent')
+        for plugin in plugins:
+            instance = instances.get(plugin.pk, plugin)
+            if instance.parent_id:
+                # The renderers of editable plugins access their parent.
+                if instance.parent_id in instances:
+                    parent_field.set_cached_value(instance, instances[instance.parent_id])
+                self.children_by_parent[instance.parent_id].append(instance)
+            else:
+                self.plugins_by_placeholder[instance.placeholder_id].append(instance)
+
+        order_field = settings.DJANGOCMS_SPA_PLUGIN_ORDER_FIELD
+        for plugin_list in list(self.plugins_by_placeholder.values()) + list(self.children_by_parent.values()):
+            plugin_list.sort(key=lambda plugin: getattr(plugin, order_field))
+
+    def get_plugins(self, placeholder):
+        return self.plugins_by_placeholder.get(placeholder.pk, [])
+
+    def get_children(self, plugin):
+        return self.children_by_parent.get(plugin.pk, [])
+
+
+def prefetch_placeholders(instances):
+    """
+    Loads the placeholders of all `PlaceholderField`s of the instances with one query. Placeholders that are already
+    loaded (e.g. with `select_related`) are kept.
+    """
+    missing_placeholders = defaultdict(list)
+    for instance in instances:
+        for field in instance._meta.fields:
+            if field.get_internal_type() != 'PlaceholderField' or field.is_cached(instance):
+                continue
+
+            placeholder_id = getattr(instance, field.attname)
+            if placeholder_id:
+                missing_placeholders[placeholder_id].append((instance, field))
+
+    if missing_placeholders:
+        for placeholder in Placeholder.objects.filter(pk__in=missing_placeholders.keys()):
+            for instance, field in missing_placeholders[placeholder.pk]:
+                field.set_cached_value(instance, placeholder)
+
+
+def get_frontend_data_dict_for_cms_page(cms_page, cms_page_title, request, placeholders, plugin_tree):
+    """
+    Returns the same data as `djangocms_spa.content_helpers.get_frontend_data_dict_for_cms_page` (without the frontend
+    editing) for the already loaded placeholders of the page and their plugin tree.
+    """
+    placeholder_frontend_data_dict = get_frontend_data_dict_for_placeholders(placeholders=placeholders,
+                                                                             request=request, plugin_tree=plugin_tree)
+    global_placeholder_data_dict = get_global_placeholder_data(placeholder_frontend_data_dict)
+    data = {
+        'containers': placeholder_frontend_data_dict,
+        'meta': {
+            'title': cms_page_title.page_title if cms_page_title.page_title else cms_page_title.title,
+            'description': cms_page_title.meta_description or '',
+        }
+    }
+
+    language_links = get_language_links(cms_page=cms_page, request=request)
+    if language_links:
+        data['meta']['languages'] = language_links
+
+    if global_placeholder_data_dict:
+        data['global_placeholder_data'] = global_placeholder_data_dict
+
+    post_processer = settings.DJANGOCMS_SPA_CMS_PAGE_DATA_POST_PROCESSOR
+    if post_processer:
+        func = get_function_by_path(post_processer)
+        data = func(cms_page=cms_page, data=data, request=request)
+
+    return data
+
+
+def get_frontend_data_dict_for_placeholders(placeholders, request, editable=False, plugin_tree=None):
+    """
+    Returns the same data as `djangocms_spa.content_helpers.get_frontend_data_dict_for_placeholders`, but loads the
+    plugins of all placeholders at once (see `PluginTree`) instead of plugin by plugin. The number of queries doesn't
+    depend on the number of placeholders and plugins. Editable placeholders are serialized by `djangocms_spa` itself.
+    The serializers follow the pinned version of `djangocms_spa`, the tests compare their output with it.
+    """
+    if editable:
+        return content_helpers.get_frontend_data_dict_for_placeholders(placeholders=placeholders, request=request,
+                                                                       editable=editable)
+
+    placeholders = [placeholder for placeholder in placeholders if placeholder]
+    if plugin_tree is None:
+        plugin_tree = PluginTree(placeholders, language=request.LANGUAGE_CODE)
+
+    data_dict = {}
+    for placeholder in placeholders:
+        plugins = [
+            get_frontend_data_dict_for_plugin(request=request, instance=instance, plugin_tree=plugin_tree)
+            for instance in plugin_tree.get_plugins(placeholder)
+        ]
+        if plugins:
+            data_dict[placeholder.slot] = {
+                'type': 'cmp-%s' % placeholder.slot,
+                'plugins': plugins,
+            }
+
+    return data_dict
+
+
+def get_frontend_data_dict_for_plugin(request, instance, plugin_tree):
+    """
+    Returns the same data as `djangocms_spa.content_helpers.get_frontend_data_dict_for_plugin` (not editable) for a
+    plugin instance of the plugin tree.
+    """
+    json_data = {}
+    if instance.pk in plugin_tree.missing_plugin_ids:
+        return json_data
+
+    plugin = instance.get_plugin_class_instance()
+
+    renderer = renderer_pool.renderer_for_plugin(plugin)
+    if renderer:
+        json_data = renderer.render(request=request, plugin=plugin, instance=instance, editable=False)
+
+    if hasattr(plugin, 'parse_child_plugins') and plugin.parse_child_plugins:
+        children = json_data.get('plugins', [])
+        for child_instance in plugin_tree.get_children(instance):
+            children.append(get_frontend_data_dict_for_plugin(request=request, instance=child_instance,
+                                                              plugin_tree=plugin_tree))
+
+        if children:
+            json_data['plugins'] = children
+
+    return json_data
@@ -0,0 +1,213 @@
+from collections import defaultdict
+
+from cms.models import Page, Title
+from cms.utils.i18n import get_fallback_languages
+from django.conf import settings
+from django.core.cache import cache
+from djangocms_spa.utils import get_function_by_path
+from menus.menu_pool import menu_pool
+
+from .cache_helpers import (get_prefetched_page_data_cache_key, get_router_cache_variant, get_router_state,
+                            is_route_skeleton_cache_active)
+from .json_helpers import dumps
+from .placeholder_helpers import PluginTree, get_frontend_data_dict_for_cms_page
+from .router_helpers import get_apphooks_with_root_url
+from .timing_helpers import timing_span
+
+PREFETCH_NODE_ATTRIBUTE = 'vue_js_prefetch'
+
+
+def get_prefetch_nodes(request, menu_nodes, policies):
+    """
+    Returns the nodes whose data is embedded in the router in the order of the given policies:
+
+    - `children`: the children of the selected node
+    - `siblings`: the siblings of the selected node
+    - `attribute`: all nodes with the attribute `vue_js_prefetch` (e.g. set by a menu modifier)
+    - the dotted path of a function that gets the request, the selected node (or `None`) and all menu nodes and
+      returns a list of nodes
+    """
+    selected_node = next((node for node in menu_nodes if node.selected), None)
+
+    prefetch_nodes = []
+    for policy in policies:
+        if policy == 'children':
+            if selected_node:
+                prefetch_nodes.extend(selected_node.children)
+        elif policy == 'siblings':
+            if selected_node and selected_node.parent:
+                prefetch_nodes.extend(selected_node.parent.children)
+            elif selected_node:
+                prefetch_nodes.extend(node for node in menu_nodes if not node.parent)
+        elif policy == 'attribute':
+            prefetch_nodes.extend(node for node in menu_nodes if node.attr.get(PREFETCH_NODE_ATTRIBUTE))
+        else:
+            func = get_function_by_path(policy)
+            prefetch_nodes.extend(func(request=request, selected_node=selected_node, menu_nodes=menu_nodes))
+
+    unique_prefetch_nodes = []
+    seen_nodes = set()
+    for node in prefetch_nodes:
+        if node not in seen_nodes and is_prefetchable_node(node):
+            seen_nodes.add(node)
+            unique_prefetch_nodes.append(node)
+    return unique_prefetch_nodes
+
+
+def is_prefetchable_node(node):
+    # Only CMS pages share one API view, the data of apphooks and named routes comes from their own views.
+    route = node.attr.get('vue_js_route')
+    if not route or not node.attr.get('is_page') or node.attr.get('named_route_path_pattern'):
+        return False
+    return not route.is_active and not route.redirect
+
+
+def add_prefetched_route_data(request, menu_nodes, routes):
+    """
+    Embeds the data of the routes selected by `DJANGOCMS_SPA_VUE_JS_PREFETCH_ROUTES` as `api.fetched` into the routes,
+    as long as the encoded data of all of them fits into `DJANGOCMS_SPA_VUE_JS_PREFETCH_ROUTES_MAX_BYTES`. The frontend
+    navigates to these routes without requesting their data. Editors always get the data of the page they load.
+    """
+    if not settings.DJANGOCMS_SPA_VUE_JS_PREFETCH_ROUTES or request is None:
+        return
+    if request.user.has_perm('cms.change_page'):
+        return
+
+    route_indexes = {route.get('name'): index for index, route in enumerate(routes)}
+    prefetch_nodes = [
+        node for node in get_prefetch_nodes(request, menu_nodes, settings.DJANGOCMS_SPA_VUE_JS_PREFETCH_ROUTES)
+        if node.attr['vue_js_route'].name in route_indexes
+    ]
+    if not prefetch_nodes:
+        return
+
+    # The menu renderer of a template context is a lazy object that doesn't provide its properties.
+    renderer = menu_pool.get_renderer(request)
+    with timing_span(request, 'vue_js_prefetch'):
+        page_data = get_prefetched_page_data(request, renderer, page_ids=[node.id for node in prefetch_nodes])
+
+    remaining_bytes = settings.DJANGOCMS_SPA_VUE_JS_PREFETCH_ROUTES_MAX_BYTES
+    for node in prefetch_nodes:
+        size, fetched = page_data[node.id]
+        if fetched is None or size > remaining_bytes:
+            continue
+
+        # The routes may be shared with the route skeleton, the prefetched route is a copy that is encoded again.
+        index = route_indexes[node.attr['vue_js_route'].name]
+        route = dict(routes[index])
+        route['api'] = dict(route['api'], fetched=fetched)
+        routes[index] = route
+        get_prefetched_route_names(request).add(route.get('name'))
+        remaining_bytes -= size
+
+
+def get_prefetched_route_names(request):
+    """
+    Returns the names of the routes whose data has been embedded into the router of the request.
+    """
+    return request.__dict__.setdefault('_vue_js_prefetched_route_names', set())
+
+
+def get_prefetched_page_data(request, renderer, page_ids):
+    """
+    Returns the size of the encoded fetched data and the fetched data of the given pages (`{page_id: (size, fetched)}`,
+    `fetched` is `None` if the page has no data in the current language). The data is cached per router state, the
+    pages that are not cached are loaded together (see `get_fetched_data_for_cms_pages`).
+    """
+    is_cache_active = is_route_skeleton_cache_active(renderer)
+    cache_keys = {}
+    page_data = {}
+    if is_cache_active:
+        router_version = get_router_state(renderer.site.pk)
+        variant = get_router_cache_variant(request)
+        cache_keys = {
+            page_id: get_prefetched_page_data_cache_key(router_version=router_version, site_id=renderer.site.pk,
+                                                        variant=variant, language=request.LANGUAGE_CODE,
+                                                        page_id=page_id)
+            for page_id in page_ids
+        }
+        cached_page_data = cache.get_many(cache_keys.values())
+        page_data = {
+            page_id: cached_page_data[cache_key]
+            for page_id, cache_key in cache_keys.items() if cache_key in cached_page_data
+        }
+
+    missing_page_ids = [page_id for page_id in page_ids if page_id not in page_data]
+    if missing_page_ids:
+        fetched_data = get_fetched_data_for_cms_pages(request, page_ids=missing_page_ids)
+        for page_id in missing_page_ids:
+            fetched = fetched_data.get(page_id)
+            page_data[page_id] = (len(dumps(fetched).encode('utf-8')) if fetched else 0, fetched)
+
+        if is_cache_active:
+            cache.set_many({cache_keys[page_id]: page_data[page_id] for page_id in missing_page_ids},
+                           settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT)
+
+    return page_data
+
+
+def get_fetched_data_for_cms_pages(request, page_ids):
+    """
+    Returns the fetched data of the given pages in the current language (`{page_id: fetched}`), the same data the
+    active route of a page gets. The titles of all pages are loaded with one query, their placeholders with another one
+    and their plugins with one query per plugin type.
+    """
+    pages = {}
+    for title in Title.objects.filter(page_id__in=page_ids).select_related('page'):
+        # One instance per page that knows all its titles, e.g. for the links to the other languages.
+        page = pages.setdefault(title.page_id, title.page)
+        page.title_cache[title.language] = title
+
+    for page in pages.values():
+        for language_code, language in settings.LANGUAGES:
+            fallback_languages = get_fallback_languages(language_code)
+            if language_code not in page.title_cache and any(map(page.title_cache.get, fallback_languages)):
+                # All titles are loaded, the page falls back to another language without reloading them.
+                page.title_cache[language_code] = None
+
+    apphooks_with_root_url = get_apphooks_with_root_url()
+    pages = {
+        page_id: page for page_id, page in pages.items()
+        if request.LANGUAGE_CODE in page.title_cache and page.application_urls not in apphooks_with_root_url
+    }
+    if not pages:
+        return {}
+
+    if hasattr(settings, 'DJANGOCMS_SPA_USE_SERIALIZERS') and settings.DJANGOCMS_SPA_USE_SERIALIZERS:
+        from djangocms_spa.serializers import PageSerializer
+        return {
+            page_id: {'response': {'data': PageSerializer(instance=page).data}} for page_id, page in pages.items()
+        }
+
+    placeholders = defaultdict(list)
+    page_placeholders = Page.placeholders.through.objects.filter(page_id__in=pages.keys()).select_related(
+        'placeholder').order_by('placeholder_id')
+    for page_placeholder in page_placeholders:
+        placeholders[page_placeholder.page_id].append(page_placeholder.placeholder)
+
+    plugin_tree = PluginTree(
+        [placeholder for page_id in pages for placeholder in placeholders[page_id]],
+        language=request.LANGUAGE_CODE
+    )
+    return {
+        page_id: {
+            'response': {
+                'data': get_frontend_data_dict_for_cms_page(
+                    cms_page=page,
+                    cms_page_title=get_page_title(page, language=request.LANGUAGE_CODE),
+                    request=request,
+                    placeholders=placeholders[page_id],
+                    plugin_tree=plugin_tree
+                )
+            }
+        } for page_id, page in pages.items()
+    }
+
+
+def get_page_title(page, language):
+    # Pages without a title in the language fall back to the title of the first fallback language that has one.
+    title = page.title_cache[language]
+    if title is None:
+        title = next(page.title_cache[fallback_language] for fallback_language in get_fallback_languages(language)
+                     if page.title_cache.get(fallback_language))
+    return title
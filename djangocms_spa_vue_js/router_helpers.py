@@ -1,4 +1,13 @@
-from django.urls import reverse
+from collections import namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+from djangocms_spa.utils import get_frontend_component_name_by_template
+
+from .json_helpers import SerializedRoute
+from .url_helpers import reverse_with_template
+
+TemplateRouteMetadata = namedtuple('TemplateRouteMetadata', ['component', 'partials'])
 
 
 def get_vue_js_link_dict(cms_page=None, instance=None, external_link=None):
@@ -6,7 +15,7 @@ def get_vue_js_link_dict(cms_page=None, instance=None, external_link=None):
         try:
             slug = cms_page.title_set.first().slug
             return {
-                'fetch': reverse('api:cms_page_detail', kwargs={'slug': slug}),
+                'fetch': reverse_with_template('api:cms_page_detail', kwargs={'slug': slug}),
                 'name': get_vue_js_router_name_for_cms_page(slug)
             }
         except:
@@ -23,3 +32,182 @@ def get_vue_js_link_dict(cms_page=None, instance=None, external_link=None):
 
 def get_vue_js_router_name_for_cms_page(pk):
     return 'cms-page-%d' % pk
+
+
+@lru_cache(maxsize=None)
+def get_template_route_metadata(template):
+    """
+    Returns the frontend component and the partials of a template as `TemplateRouteMetadata`. Templates that are not
+    part of `DJANGOCMS_SPA_TEMPLATES` use the component of the default template and no partials. The metadata is
+    compiled once per template until the settings change and shared by all routes, the partials are a tuple.
+    """
+    try:
+        component = get_frontend_component_name_by_template(template)
+    except KeyError:
+        component = settings.DJANGOCMS_SPA_TEMPLATES[settings.DJANGOCMS_SPA_DEFAULT_TEMPLATE][
+            'frontend_component_name']
+
+    try:
+        partials = tuple(settings.DJANGOCMS_SPA_TEMPLATES[template]['partials'])
+    except KeyError:
+        partials = ()
+
+    return TemplateRouteMetadata(component=component, partials=partials)
+
+
+@lru_cache(maxsize=None)
+def get_apphooks_with_root_url():
+    return frozenset(settings.DJANGOCMS_SPA_VUE_JS_APPHOOKS_WITH_ROOT_URL)
+
+
+def clear_route_metadata(**kwargs):
+    get_template_route_metadata.cache_clear()
+    get_apphooks_with_root_url.cache_clear()
+
+
+class VueJsRoute(object):
+    """
+    A route of the Vue JS router. Routes are built, attached to the menu nodes and cached in this compact form. They
+    are converted to the dict structure of the router (see `to_dict`) when the router is delivered.
+    """
+    __slots__ = ('name', 'component', 'path', 'redirect', 'params', 'meta_id', 'fetch_url', 'use_cache', 'partials',
+                 'fetched', 'json', 'compact_fragment')
+
+    def __init__(self, name=None, component=None, path=None, redirect=None, params=None, meta_id=None, fetch_url=None,
+                 use_cache=True, partials=None, fetched=None, json=None, compact_fragment=None):
+        self.name = name
+        self.component = component
+        self.path = path
+        self.redirect = redirect
+        self.params = params  # the params of the active route
+        self.meta_id = meta_id
+        self.fetch_url = fetch_url
+        self.use_cache = use_cache
+        self.partials = partials  # the partials the frontend needs to fetch with the data of the route
+        self.fetched = fetched  # the data of the active route
+        self.json = json  # the encoded route, set as soon as the route is cached
+        self.compact_fragment = compact_fragment  # the encoded compact route, set together with the JSON
+
+    def __getstate__(self):
+        # Pickle the values only, without the names of the slots.
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    @property
+    def is_active(self):
+        return self.fetched is not None
+
+    def to_dict(self):
+        """
+        Returns the route as dict. The dict of a cached route carries the encoded JSON (see `SerializedRoute`).
+        """
+        route = {}
+        if not self.redirect:
+            fetch = {'url': self.fetch_url}
+            if not self.use_cache:
+                fetch['useCache'] = False
+            if self.partials:
+                fetch['query'] = {'partials': self.partials}
+            route['api'] = {'fetch': fetch}
+            if self.fetched is not None:
+                route['api']['fetched'] = self.fetched
+
+        route['name'] = self.name
+        if self.component is not None:
+            route['component'] = self.component
+        if self.redirect:
+            route['redirect'] = self.redirect
+        if self.params is not None:
+            route['params'] = self.params
+        if self.meta_id:
+            route['meta'] = {'id': self.meta_id}
+        route['path'] = self.path
+
+        if self.json is not None:
+            return SerializedRoute(route, self.json, self.compact_fragment)
+        return route
+
+
+RouteMatch = namedtuple('RouteMatch', ['route', 'params'])
+
+
+class RoutePathIndex(object):
+    """
+    A trie over the segments of the route paths. Segments starting with a colon (e.g. `:slug` of a named route path
+    pattern) match any segment of the requested path. A path is matched in O(number of segments), independent of the
+    number of routes.
+    """
+    __slots__ = ('children', 'param_name', 'param_child', 'route')
+
+    def __init__(self):
+        self.children = {}
+        self.param_name = None
+        self.param_child = None
+        self.route = None
+
+    def add(self, path, route):
+        index = self
+        for segment in get_path_segments(path):
+            if segment.startswith(':'):
+                if index.param_child is None:
+                    index.param_name = segment[1:]
+                    index.param_child = RoutePathIndex()
+                index = index.param_child
+            else:
+                index = index.children.setdefault(segment, RoutePathIndex())
+
+        if index.route is None:
+            index.route = route  # the first route of a path wins, like in the Vue JS router
+
+    def match(self, path):
+        """
+        Returns the route of the path and the values of its params as `RouteMatch` or `None` if no route matches.
+        Routes with static segments are preferred over routes with params.
+        """
+        return self._match(get_path_segments(path), 0, {})
+
+    def _match(self, segments, position, params):
+        if position == len(segments):
+            return RouteMatch(route=self.route, params=params) if self.route is not None else None
+
+        segment = segments[position]
+        child = self.children.get(segment)
+        if child is not None:
+            route_match = child._match(segments, position + 1, params)
+            if route_match:
+                return route_match
+
+        if self.param_child is not None:
+            return self.param_child._match(segments, position + 1, dict(params, **{self.param_name: segment}))
+
+        return None
+
+
+def get_path_segments(path):
+    return [segment for segment in path.split('/') if segment]
+
+
+def get_route_path_index(routes):
+    """
+    Returns a `RoutePathIndex` of the given routes (dicts of the router). Routes of CMS pages don't contain the
+    language prefix if `DJANGOCMS_SPA_VUE_JS_USE_I18N_PATTERNS` is not set, use `match_route_path` to look them up.
+    """
+    route_path_index = RoutePathIndex()
+    for route in routes:
+        route_path_index.add(route['path'], route)
+    return route_path_index
+
+
+def match_route_path(route_path_index, path):
+    """
+    Returns the `RouteMatch` of the path. Paths that don't match with their language prefix are matched without it.
+    """
+    route_match = route_path_index.match(path)
+    if route_match is None:
+        segments = get_path_segments(path)
+        if segments and segments[0] in dict(settings.LANGUAGES):
+            route_match = route_path_index.match('/'.join(segments[1:]))
+    return route_match
@@ -0,0 +1,47 @@
+from cms import operations
+
+from .cache_helpers import (get_named_route_group, invalidate_model_routes, invalidate_routes,
+                            update_partials_version, update_router_version)
+from .models import DjangocmsVueJsMixin
+
+
+def get_page_ids(page):
+    # Menu nodes use the draft or the public version of a page, depending on the request.
+    return [page_id for page_id in [page.pk, page.publisher_public_id] if page_id]
+
+
+def invalidate_routes_of_page(page):
+    invalidate_routes(site_ids=[page.node.site_id], page_ids=get_page_ids(page))
+
+
+def invalidate_routes_on_publish(sender, instance, language=None, **kwargs):
+    invalidate_routes_of_page(instance)
+
+
+def invalidate_routes_on_page_moved(sender, instance, **kwargs):
+    invalidate_routes_of_page(instance)
+
+
+def invalidate_routes_on_page_operation(sender, operation, obj=None, **kwargs):
+    if operation == operations.MOVE_PAGE and obj:
+        invalidate_routes_of_page(obj)
+    elif operation == operations.PUBLISH_STATIC_PLACEHOLDER:
+        # Static placeholders are rendered into the partials of every page. Their drafts are saved on every edit (and
+        # not shown from the cache), only publishing them changes the cached partials.
+        update_partials_version()
+        update_router_version()
+
+
+def invalidate_routes_on_page_delete(sender, instance, **kwargs):
+    invalidate_routes_of_page(instance)
+
+
+def invalidate_routes_on_model_change(sender, instance, **kwargs):
+    if not isinstance(instance, DjangocmsVueJsMixin):
+        return
+
+    # The routes of the instance and the named route group it belongs to are affected, the pages are not.
+    invalidate_model_routes(
+        urls=[instance.get_absolute_url()],
+        named_route_groups=[get_named_route_group(instance.vue_js_router_name, instance.get_detail_path_pattern())]
+    )
@@ -1,20 +1,22 @@
-import json
-
 from django import template
-from django.conf import settings
 from django.utils.safestring import mark_safe
 
+from ..json_helpers import get_vue_js_router_json
 from ..menu_helpers import get_vue_js_router
+from ..timing_helpers import timing_span
 
 register = template.Library()
 
 
 @register.simple_tag(takes_context=True)
 def vue_js_router(context):
+    request = context.get('request')
     if 'vue_js_router' in context:
         router = context['vue_js_router']
     else:
-        router = get_vue_js_router(context=context)
+        with timing_span(request, 'vue_js_router'):
+            router = get_vue_js_router(context=context)
 
-    router_json = json.dumps(router, cls=settings.DJANGOCMS_SPA_JSON_ENCODER)
+    with timing_span(request, 'vue_js_router_json'):
+        router_json = get_vue_js_router_json(router)
     return mark_safe(router_json)
@@ -0,0 +1,55 @@
+import time
+from contextlib import nullcontext
+
+from django.conf import settings
+from djangocms_spa.utils import get_function_by_path
+
+NO_TIMING_SPAN = nullcontext()
+
+
+class TimingSpan(object):
+    """
+    Adds the duration of its block to the timings of the request. Spans with the same name are summed up (e.g. the
+    routes of all nodes).
+    """
+    __slots__ = ('timings', 'name', 'started')
+
+    def __init__(self, request, name):
+        self.timings = request.__dict__.setdefault('_vue_js_timings', {})
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.timings[self.name] = self.timings.get(self.name, 0) + time.perf_counter() - self.started
+
+
+def timing_span(request, name):
+    """
+    Returns a context manager that times its block (see `TimingSpan`). If the timing is disabled, a shared context
+    manager that does nothing is returned.
+    """
+    if request is None or not settings.DJANGOCMS_SPA_VUE_JS_TIMING:
+        return NO_TIMING_SPAN
+    return TimingSpan(request, name)
+
+
+def get_timings(request):
+    """
+    Returns the timings of the request in seconds (`{name: duration}`).
+    """
+    return request.__dict__.get('_vue_js_timings', {})
+
+
+def get_server_timing_header(timings):
+    return ', '.join('%s;dur=%.1f' % (name, duration * 1000) for name, duration in timings.items())
+
+
+def send_timings(request, timings):
+    # The callback gets the name of each stage, its duration in seconds and the request.
+    if settings.DJANGOCMS_SPA_VUE_JS_TIMING_CALLBACK:
+        callback = get_function_by_path(settings.DJANGOCMS_SPA_VUE_JS_TIMING_CALLBACK)
+        for name, duration in timings.items():
+            callback(name, duration, request)
@@ -0,0 +1,136 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.conf import settings
+from django.urls import NoReverseMatch, Resolver404, get_resolver, get_script_prefix, get_urlconf, reverse
+from django.urls.converters import get_converter
+from django.utils.translation import get_language
+from djangocms_spa.utils import get_function_by_path
+
+from .timing_helpers import timing_span
+
+UrlTemplate = namedtuple('UrlTemplate', ['parts', 'arguments', 'converters'])
+
+URL_TEMPLATE_PLACEHOLDER = '918273645%d918273645'  # digits pass the common path converters (int, slug, str, path)
+URL_TEMPLATE_SAFE_CHARACTERS = "!$&'()*+,;=/~:@"  # the characters `reverse` doesn't quote
+ROUTE_PARAMETER_PATTERN = re.compile(r'<(?:(?P<converter>[^>:]+):)?(?P<parameter>[^>]+)>')  # like Django's
+
+_cached_resolve_url = None
+
+
+class ResolvedUrl(namedtuple('ResolvedUrl', ['view_path', 'url_name', 'kwargs'])):
+    __slots__ = ()
+
+    @property
+    def view(self):
+        # This is the same as `djangocms_spa.utils.get_view_from_url`. The view is imported on access, views that
+        # can't be imported by their dotted path (e.g. admin views) raise an `AttributeError` or `ImportError`.
+        return get_function_by_path(self.view_path)
+
+
+def _resolve_url(resolver, language, url):
+    # The language is part of the cache key, the URL patterns (e.g. `i18n_patterns`) depend on it.
+    try:
+        resolver_match = resolver.resolve(url)
+    except Resolver404:
+        return None
+
+    return ResolvedUrl(view_path=resolver_match._func_path, url_name=resolver_match.url_name,
+                       kwargs=resolver_match.kwargs)
+
+
+def get_cached_resolve_url():
+    global _cached_resolve_url
+    if _cached_resolve_url is None:
+        _cached_resolve_url = lru_cache(maxsize=settings.DJANGOCMS_SPA_VUE_JS_RESOLVED_URLS_CACHE_SIZE)(_resolve_url)
+    return _cached_resolve_url
+
+
+def resolve_url(url, request=None):
+    """
+    Returns the view, the URL name and the keyword arguments of a URL as `ResolvedUrl` or `None` if the URL can't be
+    resolved. The results are memoized per request and language and in a bounded, process wide cache. The process
+    wide cache is bound to the resolver of the active URLconf, reloading the URLconf (e.g. after changing an apphook)
+    creates a new resolver and therefore never returns outdated results.
+    """
+    if request is not None:
+        resolved_urls = request.__dict__.setdefault('_vue_js_resolved_urls', {})
+        cache_key = (get_language(), url)
+        if cache_key not in resolved_urls:
+            with timing_span(request, 'vue_js_resolve'):
+                resolved_urls[cache_key] = resolve_url(url)
+        return resolved_urls[cache_key]
+
+    if not url:
+        return None
+
+    return get_cached_resolve_url()(get_resolver(get_urlconf()), get_language(), url)
+
+
+def clear_resolved_urls(**kwargs):
+    if _cached_resolve_url is not None:
+        _cached_resolve_url.cache_clear()
+
+
+@lru_cache(maxsize=256)
+def _get_url_template(resolver, script_prefix, language, viewname, arg_count, kwarg_names):
+    arguments = list(range(arg_count)) + list(kwarg_names)
+    placeholders = {argument: URL_TEMPLATE_PLACEHOLDER % index for index, argument in enumerate(arguments)}
+    try:
+        url = reverse(viewname, urlconf=resolver.urlconf_name,
+                      args=[placeholders[index] for index in range(arg_count)],
+                      kwargs={name: placeholders[name] for name in kwarg_names})
+    except NoReverseMatch:
+        return None
+
+    # Split the URL at the placeholders. Each placeholder has to show up exactly once.
+    if any(url.count(placeholder) != 1 for placeholder in placeholders.values()):
+        return None
+
+    # The values are converted by the converters of the route parameters, like `reverse` does.
+    try:
+        route = resolver.resolve('/' + url[len(script_prefix):]).route
+    except Resolver404:
+        return None
+    route_converters = {
+        match.group('parameter'): get_converter(match.group('converter') or 'str')
+        for match in ROUTE_PARAMETER_PATTERN.finditer(route or '')
+    }
+
+    arguments.sort(key=lambda argument: url.index(placeholders[argument]))
+    parts = []
+    for argument in arguments:
+        part, url = url.split(placeholders[argument])
+        parts.append(part)
+    parts.append(url)
+    converters = [route_converters.get(argument) for argument in arguments]
+    return UrlTemplate(parts=parts, arguments=arguments, converters=converters)
+
+
+def reverse_with_template(viewname, args=None, kwargs=None):
+    """
+    Returns the same URL as `reverse`. Each URL name is reversed once (per URLconf, language and argument names) with
+    placeholder values, all other calls only put the converted (`to_url` of the path converter) and quoted values into
+    this template. The values are not validated against the URL pattern. URLs whose converters don't accept the
+    placeholders are reversed on each call.
+    """
+    args = args or ()
+    kwargs = kwargs or {}
+    url_template = _get_url_template(get_resolver(get_urlconf()), get_script_prefix(), get_language(), viewname,
+                                     len(args), tuple(sorted(kwargs)))
+    if url_template is None:
+        return reverse(viewname, args=args, kwargs=kwargs)
+
+    values = [args[argument] if isinstance(argument, int) else kwargs[argument] for argument in url_template.arguments]
+    url = [url_template.parts[0]]
+    for value, converter, part in zip(values, url_template.converters, url_template.parts[1:]):
+        value = converter.to_url(value) if converter else str(value)
+        url.append(quote(value, safe=URL_TEMPLATE_SAFE_CHARACTERS))
+        url.append(part)
+    return ''.join(url)
+
+
+def clear_url_templates(**kwargs):
+    _get_url_template.cache_clear()
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from .views import VueRouterChunkView, VueRouterManifestView
+
+app_name = 'djangocms_spa_vue_js'
+urlpatterns = [
+    path('manifest/<str:language>/', VueRouterManifestView.as_view(), name='vue_js_router_manifest'),
+    path('manifest/<str:language>/<str:version>/', VueRouterManifestView.as_view(),
+         name='vue_js_router_manifest_version'),
+    path('routes/<str:language>/<str:subtree>/', VueRouterChunkView.as_view(), name='vue_js_router_chunk'),
+]
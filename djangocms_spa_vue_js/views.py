@@ -1,22 +1,102 @@
+import asyncio
+import copy
+import hashlib
+
+from cms.utils import get_current_site
+from cms.utils.conf import get_cms_setting
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.views.generic import TemplateView
-from djangocms_spa.content_helpers import get_frontend_data_dict_for_partials, get_partial_names_for_template
-from djangocms_spa.decorators import cache_view
+from django.db import close_old_connections, connections
+from django.db.models import Count, Max
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import redirect
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.translation import get_language
+from django.views.generic import TemplateView, View
+from djangocms_spa.content_helpers import get_partial_names_for_template
 from djangocms_spa.views import MultipleObjectSpaMixin, SingleObjectSpaMixin
 
-from .menu_helpers import get_vue_js_router
+from .cache_helpers import (disable_response_caches, get_router_cache_variant, get_router_state,
+                            is_response_cache_disabled, is_shared_router_cache_variant)
+from .decorators import cache_view_per_variant
+from .json_helpers import get_vue_js_router_json
+from .manifest_helpers import (get_cached_router_manifest_etag, get_cached_vue_js_router_manifest,
+                               get_encoded_manifest_content)
+from .menu_helpers import get_vue_js_router, get_vue_js_router_chunk
+from .models import DjangocmsVueJsMixin
+from .partial_helpers import get_frontend_data_dict_for_partials
+from .prefetch_helpers import get_prefetched_route_names
+from .router_helpers import get_route_path_index, match_route_path
+from .timing_helpers import get_timings, timing_span
+
+try:
+    from asgiref.sync import async_to_sync, sync_to_async
+except ImportError:
+    async_to_sync = sync_to_async = None
 
 
 class VueRouterView(TemplateView):
     fetch_url = None
     add_language_code = len(settings.LANGUAGES) > 1
+    modification_date_field = None  # e.g. `modified`, used to validate the responses of list and detail views
 
-    @cache_view
     def dispatch(self, request, **kwargs):
+        # Answer conditional requests before anything (e.g. the router) is built.
+        etag = self.get_etag()
+        if etag:
+            response = get_conditional_response(request, etag=etag)
+            if response:
+                return response
+
+        response = self.get_cached_response(request, **kwargs)
+        if etag and response.status_code == 200:
+            response['ETag'] = etag
+            if request.user.is_authenticated:
+                # Shared by the users of the variant, but not by proxies.
+                patch_cache_control(response, private=True)
+        return response
+
+    @cache_view_per_variant
+    def get_cached_response(self, request, **kwargs):
         return super(VueRouterView, self).dispatch(request, **kwargs)
 
     def get_cache_key(self):
+        # The variant is added by `cache_view_per_variant`.
+        return '{prefix}vue_js_router_view_{validator}_{path}'.format(
+            prefix=get_cms_setting('CACHE_PREFIX'),
+            validator=self.get_validator() or get_router_state(get_current_site().pk),
+            path=self.request.get_full_path()
+        )
+
+    def get_etag(self):
+        validator = self.get_validator()
+        return '"%s"' % validator if validator else None
+
+    def get_validator(self):
+        """
+        Returns a hash of the router state (see `get_router_state`) and the modification state of the view or `None` if
+        the view can't be validated. Only the responses of shared visibility variants are validated.
+        """
+        if not hasattr(self, '_validator'):
+            self._validator = None
+            variant = get_router_cache_variant(self.request)
+            if is_shared_router_cache_variant(variant):
+                modification_state = self.get_modification_state()
+                if modification_state is not None:
+                    validator_parts = [get_router_state(get_current_site().pk), variant, self.request.get_full_path(),
+                                       get_language(), modification_state]
+                    self._validator = hashlib.md5(repr(validator_parts).encode('utf-8')).hexdigest()
+        return self._validator
+
+    def get_modification_state(self):
+        """
+        Override this method to enable conditional requests. Return a value that changes whenever the data of this
+        view changes. Changes of the routes, placeholders and models using `DjangocmsVueJsMixin` are already covered
+        by the router state, views without fetched data of their own are validated by it alone.
+        """
+        if type(self).get_fetched_data is VueRouterView.get_fetched_data:
+            return ()
         return None
 
     def get_context_data(self, **kwargs):
@@ -25,21 +105,28 @@ class VueRouterView(TemplateView):
         }
 
     def get_vue_js_router_including_fetched_data(self):
-        vue_js_router = self.get_vue_js_router(request=self.request)
+        with timing_span(self.request, 'vue_js_router'):
+            vue_js_router = self.get_vue_js_router(request=self.request)
 
-        # Put the context data of this view into the active route.
         active_route = self.get_active_route(vue_js_router['routes'])
         if active_route:
-            active_route['api']['fetched']['response']['data'].update(self.get_fetched_data())
+            with timing_span(self.request, 'vue_js_page_data'):
+                fetched_data = self.get_fetched_data()
             partial_names = get_partial_names_for_template(template=self.template_name)
-            active_route['api']['fetched']['response']['partials'] = self.get_view_partials(partial_names=partial_names)
-
-            url_params_for_active_route = self.get_url_params_for_active_route()
-            if url_params_for_active_route:
-                active_route['api']['fetched']['params'] = url_params_for_active_route
+            partials = self.get_view_partials(partial_names=partial_names)
+            self.update_active_route(active_route, fetched_data=fetched_data, partials=partials)
 
         return vue_js_router
 
+    def update_active_route(self, active_route, fetched_data, partials):
+        # Put the context data of this view into the active route.
+        active_route['api']['fetched']['response']['data'].update(fetched_data)
+        active_route['api']['fetched']['response']['partials'] = partials
+
+        url_params_for_active_route = self.get_url_params_for_active_route()
+        if url_params_for_active_route:
+            active_route['api']['fetched']['params'] = url_params_for_active_route
+
     def get_vue_js_router(self, request):
         return get_vue_js_router(request=request)
 
@@ -55,13 +142,27 @@ class VueRouterView(TemplateView):
         )
 
     def get_active_route(self, routes):
+        # Prefetched routes contain fetched data as well, but they are not the route of this view.
+        prefetched_route_names = get_prefetched_route_names(self.request)
+
+        # The active route usually matches the requested path (or its named route path pattern).
+        route_match = match_route_path(self.get_route_path_index(routes), self.request.path)
+        if route_match and is_active_route(route_match.route, prefetched_route_names):
+            return route_match.route
+
+        # Routes that are selected by their URL name only (e.g. apphooks whose route path differs from the URL).
         for route in routes:
-            is_active_route = 'api' in route and 'fetched' in route['api']
-            if is_active_route:
+            if is_active_route(route, prefetched_route_names):
                 return route
 
         return None
 
+    def get_route_path_index(self, routes):
+        # The index is built once per router and reused for all lookups of this request.
+        if getattr(self, '_route_path_index', (None, None))[0] is not routes:
+            self._route_path_index = (routes, get_route_path_index(routes))
+        return self._route_path_index[1]
+
     def get_fetch_url(self):
         if self.fetch_url:
             return self.fetch_url
@@ -72,9 +173,194 @@ class VueRouterView(TemplateView):
         return {}
 
 
+def is_active_route(route, prefetched_route_names):
+    return 'api' in route and 'fetched' in route['api'] and route.get('name') not in prefetched_route_names
+
+
 class VueRouterListView(MultipleObjectSpaMixin, VueRouterView):
-    pass
+    def get_modification_state(self):
+        # One aggregate query: added and removed objects change the count or the highest pk, changed objects the
+        # modification date. Changes of models using `DjangocmsVueJsMixin` are covered by the router state.
+        queryset = self.get_queryset().order_by()
+        if self.modification_date_field:
+            return queryset.aggregate(Count('pk'), Max('pk'), Max(self.modification_date_field))
+        elif issubclass(queryset.model, DjangocmsVueJsMixin):
+            return queryset.aggregate(Count('pk'), Max('pk'))
+        return None
 
 
 class VueRouterDetailView(SingleObjectSpaMixin, VueRouterView):
+    def get_modification_state(self):
+        self.object = self.get_object()
+        if self.modification_date_field:
+            return [self.object.pk, getattr(self.object, self.modification_date_field)]
+        elif isinstance(self.object, DjangocmsVueJsMixin):
+            return self.object.pk
+        return None
+
+    def get_object(self, queryset=None):
+        # The object is already loaded to validate the request.
+        if queryset is None and self.object is not None:
+            return self.object
+        return super(VueRouterDetailView, self).get_object(queryset=queryset)
+
+
+class AsyncVueRouterMixin(object):
+    """
+    Builds the router, the fetched data and the partials of the view concurrently, each of them in its own thread
+    (with its own database connection) and with its own copy of the view and the request. `get_fetched_data` may be a
+    coroutine function. The view itself stays synchronous, Django runs it in a thread under ASGI. Within a transaction
+    (e.g. `ATOMIC_REQUESTS`) the steps run one after another, the other connections wouldn't see its changes.
+    """
+
+    def get_vue_js_router_including_fetched_data(self):
+        if async_to_sync is None:
+            raise ImproperlyConfigured('AsyncVueRouterMixin requires asgiref (Django 3.0 or newer).')
+        if any(connection.in_atomic_block for connection in connections.all()):
+            return super(AsyncVueRouterMixin, self).get_vue_js_router_including_fetched_data()
+        return async_to_sync(self.get_vue_js_router_including_fetched_data_async)()
+
+    async def get_vue_js_router_including_fetched_data_async(self):
+        partial_names = get_partial_names_for_template(template=self.template_name)
+        router_view, fetched_data_view, partials_view = [self.get_thread_view() for __ in range(3)]
+        vue_js_router, fetched_data, partials = await asyncio.gather(
+            run_in_thread(router_view.get_timed_vue_js_router),
+            fetched_data_view.get_fetched_data_async(),
+            run_in_thread(partials_view.get_view_partials, partial_names=partial_names),
+        )
+        for view in [router_view, fetched_data_view, partials_view]:
+            self.merge_thread_view(view)
+
+        active_route = self.get_active_route(vue_js_router['routes'])
+        if active_route:
+            self.update_active_route(active_route, fetched_data=fetched_data, partials=partials)
+
+        return vue_js_router
+
+    def get_thread_view(self):
+        # The state a step keeps on the request (e.g. its timings) isn't shared with the steps in the other threads.
+        view = copy.copy(self)
+        view.request = copy.copy(self.request)
+        view.request.__dict__['_vue_js_timings'] = {}
+        view.request.__dict__['_vue_js_prefetched_route_names'] = set()
+        return view
+
+    def merge_thread_view(self, view):
+        timings = self.request.__dict__.setdefault('_vue_js_timings', {})
+        for name, duration in get_timings(view.request).items():
+            timings[name] = timings.get(name, 0) + duration
+        if is_response_cache_disabled(view.request):
+            disable_response_caches(self.request)
+        get_prefetched_route_names(self.request).update(get_prefetched_route_names(view.request))
+
+    def get_timed_vue_js_router(self):
+        with timing_span(self.request, 'vue_js_router'):
+            return self.get_vue_js_router(request=self.request)
+
+    async def get_fetched_data_async(self):
+        with timing_span(self.request, 'vue_js_page_data'):
+            if asyncio.iscoroutinefunction(self.get_fetched_data):
+                return await self.get_fetched_data()
+            return await run_in_thread(self.get_fetched_data)
+
+
+class AsyncVueRouterView(AsyncVueRouterMixin, VueRouterView):
     pass
+
+
+class AsyncVueRouterListView(AsyncVueRouterMixin, VueRouterListView):
+    pass
+
+
+class AsyncVueRouterDetailView(AsyncVueRouterMixin, VueRouterDetailView):
+    pass
+
+
+def run_in_thread(function, **kwargs):
+    """
+    Returns an awaitable that calls the function in a thread of its own, using the active language of the caller.
+    """
+    language = translation.get_language()
+
+    def run():
+        try:
+            with translation.override(language):
+                return function(**kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=False)()
+
+
+class VueRouterChunkView(View):
+    """
+    Returns the routes of a subtree of the menu. Used by the frontend to load the chunks of a lazy router.
+    """
+
+    def get(self, request, language, subtree):
+        if language not in dict(settings.LANGUAGES):
+            return JsonResponse(data={}, status=404)
+
+        with translation.override(language):
+            request.LANGUAGE_CODE = language
+            vue_js_router_chunk = get_vue_js_router_chunk(request=request, language=language, subtree=subtree)
+
+        if vue_js_router_chunk is None:
+            return JsonResponse(data={}, status=404)
+
+        response = HttpResponse(content=get_vue_js_router_json(vue_js_router_chunk), content_type='application/json')
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True)
+        else:
+            patch_cache_control(response, public=True, max_age=settings.DJANGOCMS_SPA_VUE_JS_ROUTER_CHUNK_MAX_AGE)
+        return response
+
+
+class VueRouterManifestView(View):
+    """
+    Returns all routes of a language together with their version. Clients revalidate the unversioned URL with its
+    ETag, the versioned URL never changes and can be cached for a long time.
+    """
+
+    def get(self, request, language, version=None):
+        if language not in dict(settings.LANGUAGES):
+            return JsonResponse(data={}, status=404)
+
+        with translation.override(language):
+            request.LANGUAGE_CODE = language
+
+            # Cached manifests are validated by the router state, without loading or building them.
+            etag = get_cached_router_manifest_etag(request)
+            if etag and not version:
+                response = get_conditional_response(request, etag=etag)
+                if response is not None:
+                    return self.patch_response_headers(request, response, etag=etag, version=version)
+
+            manifest = get_cached_vue_js_router_manifest(request=request, language=language)
+
+        if version and version != manifest.version:
+            return redirect('djangocms_spa_vue_js:vue_js_router_manifest_version', language=language,
+                            version=manifest.version)
+
+        # The ETag is weak, all encodings of the manifest share it.
+        etag = etag or 'W/"%s"' % manifest.version
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            content, encoding = get_encoded_manifest_content(manifest, request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            response = HttpResponse(content=content, content_type='application/json')
+            if encoding:
+                response['Content-Encoding'] = encoding
+
+        return self.patch_response_headers(request, response, etag=etag, version=version)
+
+    def patch_response_headers(self, request, response, etag, version):
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Accept-Encoding'])
+        if request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+        elif version:
+            patch_cache_control(response, public=True, immutable=True,
+                                max_age=settings.DJANGOCMS_SPA_VUE_JS_ROUTER_MANIFEST_MAX_AGE)
+        else:
+            patch_cache_control(response, public=True, no_cache=True)
+        return response
@@ -0,0 +1,133 @@
+import gzip
+import os
+import time
+from collections import namedtuple
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sites.models import Site
+from django.db import close_old_connections
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.utils import translation
+from djangocms_spa.content_helpers import get_partial_names_for_template
+
+from .cache_helpers import get_router_cache_variant
+from .manifest_helpers import get_vue_js_router_manifests, set_cached_vue_js_router_manifests
+from .menu_helpers import get_menu_renderer
+from .partial_helpers import get_frontend_data_dict_for_partials
+
+CacheWarmupTask = namedtuple('CacheWarmupTask', ['site_id', 'languages', 'username'])
+CACHE_WARMUP_STAGES = ('router', 'partials', 'manifest')
+
+
+def get_cache_warmup_tasks(site_ids=None, languages=None, usernames=None, per_language=False):
+    """
+    Returns a task for each combination of site and user, covering all languages. The anonymous user (`None`) is
+    always included, the other users select the permission variants to warm up. With `per_language` every language
+    is a task of its own, e.g. to warm them up in parallel processes instead of sharing their queries.
+    """
+    if site_ids is None:
+        site_ids = Site.objects.order_by('pk').values_list('pk', flat=True)
+    if languages is None:
+        languages = [language_code for language_code, language in settings.LANGUAGES]
+
+    if per_language:
+        task_languages = [(language,) for language in languages]
+    else:
+        task_languages = [tuple(languages)]
+
+    return [
+        CacheWarmupTask(site_id=site_id, languages=languages, username=username)
+        for site_id in site_ids
+        for username in [None] + list(usernames or [])
+        for languages in task_languages
+    ]
+
+
+def get_cache_warmup_request(task):
+    # The requested URL doesn't match any node, the routes of all nodes are cached.
+    request = RequestFactory().get('/%s/vue-js-router-warmup/' % task.languages[0])
+    if task.username:
+        request.user = get_user_model().objects.get_by_natural_key(task.username)
+    else:
+        request.user = AnonymousUser()
+    request.session = {}
+    request.LANGUAGE_CODE = task.languages[0]
+    return request
+
+
+def get_static_placeholder_partial_names():
+    """
+    Returns the distinct partial names of all SPA templates without the partials with a custom callback, they depend on
+    the request and are never cached.
+    """
+    partial_names = set()
+    for template in settings.DJANGOCMS_SPA_TEMPLATES:
+        names = get_partial_names_for_template(template=template)
+        partial_names.add(tuple(name for name in names if name not in settings.DJANGOCMS_SPA_PARTIAL_CALLBACKS))
+    return [list(names) for names in partial_names if names]
+
+
+def warm_caches(task, manifest_root=None):
+    """
+    Builds the routers of all languages of the task together and the partials of each language to fill their
+    caches. The manifests of anonymous users are written to `manifest_root` if given. Returns the task, its permission
+    variant and the durations of its stages in seconds.
+    """
+    durations = {}
+    variant = None
+    try:
+        with override_settings(SITE_ID=task.site_id):
+            request = get_cache_warmup_request(task)
+            variant = get_router_cache_variant(request)
+
+            started = time.perf_counter()
+            manifests = get_vue_js_router_manifests(request=request, languages=task.languages)
+            set_cached_vue_js_router_manifests(request, get_menu_renderer(request=request), manifests)
+            durations['router'] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            editable = request.user.has_perm('cms.edit_static_placeholder')
+            for language in task.languages:
+                with translation.override(language):
+                    request.LANGUAGE_CODE = language
+                    for partial_names in get_static_placeholder_partial_names():
+                        get_frontend_data_dict_for_partials(partials=partial_names, request=request, editable=editable)
+            durations['partials'] = time.perf_counter() - started
+
+            if manifest_root and not task.username:
+                started = time.perf_counter()
+                for language, manifest in manifests.items():
+                    write_manifest_files(manifest, os.path.join(manifest_root, str(task.site_id), language))
+                durations['manifest'] = time.perf_counter() - started
+    finally:
+        close_old_connections()
+
+    return task, variant, durations
+
+
+def write_manifest_files(manifest, directory):
+    """
+    Writes the manifest as `<version>.json` and `index.json` to the directory, together with gzipped copies if the
+    manifest compression is active. Files are replaced atomically, the web server never serves a partial file.
+    """
+    os.makedirs(directory, exist_ok=True)
+    contents = {'.json': manifest.content}
+    if settings.DJANGOCMS_SPA_VUE_JS_ROUTER_MANIFEST_COMPRESSION:
+        contents['.json.gz'] = gzip.compress(manifest.content)
+
+    for extension, content in contents.items():
+        for name in (manifest.version, 'index'):
+            path = os.path.join(directory, name + extension)
+            temporary_path = '%s.%d.tmp' % (path, os.getpid())
+            with open(temporary_path, 'wb') as manifest_file:
+                manifest_file.write(content)
+            os.replace(temporary_path, path)
+
+
+def init_cache_warmup_process():
+    # Processes that are spawned instead of forked start without a configured Django.
+    django.setup()
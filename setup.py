@@ -57,7 +57,8 @@ setup(
     ],
     include_package_data=True,
     install_requires=[
-        'djangocms-spa'
+        # placeholder_helpers copies the plugin serializers of this version, check its output before upgrading.
+        'djangocms-spa==0.1.28'
     ],
     license="MIT",
     zip_safe=False,
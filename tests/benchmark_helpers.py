@@ -0,0 +1,182 @@
+import copy
+import random
+import statistics
+import time
+
+from cms.api import create_page
+from cms.constants import TEMPLATE_INHERITANCE_MAGIC
+from cms.utils.conf import get_cms_setting
+from django.contrib.auth.models import AnonymousUser
+from django.template import Context, Template
+from django.test import RequestFactory
+from django.utils import translation
+from menus.base import NavigationNode
+from menus.menu_pool import MenuRenderer, menu_pool
+
+from djangocms_spa_vue_js.cms_menus import VueJsMenuModifier
+from djangocms_spa_vue_js.menu_helpers import get_node_route, get_vue_js_router
+
+BENCHMARK_STAGES = ('modify', 'get_node_route', 'get_vue_js_router', 'template_tag')
+SYNTHETIC_APPHOOK_MENU = 'SyntheticApphookMenu'
+ROUTER_TEMPLATE = '{% load router_tags %}{% vue_js_router %}'
+
+
+class SyntheticMenuRenderer(MenuRenderer):
+    """
+    A menu renderer that adds synthetic apphook nodes to the nodes of the CMS pages. The nodes of the CMS pages are
+    cached with their own key, they never show up in the menus of the site.
+    """
+
+    def __init__(self, pool, request, apphook_nodes):
+        super(SyntheticMenuRenderer, self).__init__(pool, request)
+        self.apphook_nodes = apphook_nodes
+
+    @property
+    def cache_key(self):
+        return '%s:vue_js_benchmark' % super(SyntheticMenuRenderer, self).cache_key
+
+    def _build_nodes(self):
+        # The modifiers change the nodes, every renderer gets its own copy.
+        return copy.deepcopy(super(SyntheticMenuRenderer, self)._build_nodes() + self.apphook_nodes)
+
+
+def create_synthetic_page_tree(size, depth, language):
+    """
+    Creates a tree of `size` published CMS pages with up to `depth` levels. Pages below the first level inherit their
+    template. Run it inside a transaction that is rolled back.
+    """
+    rng = random.Random(size)
+    template = get_cms_setting('TEMPLATES')[0][0]
+    pages_by_level = [[] for __ in range(depth)]
+    pages = []
+
+    for index in range(size):
+        level = index % depth
+        while level and not pages_by_level[level - 1]:
+            level -= 1
+
+        parent = rng.choice(pages_by_level[level - 1]) if level else None
+        page = create_page(
+            title='Benchmark page %d' % index,
+            template=TEMPLATE_INHERITANCE_MAGIC if parent else template,
+            language=language,
+            slug='benchmark-page-%d' % index,
+            parent=parent,
+            published=True
+        )
+        pages_by_level[level].append(page)
+        pages.append(page)
+
+    return pages
+
+
+def get_synthetic_apphook_nodes(size, named_route_groups, language):
+    """
+    Returns `size` apphook nodes like the ones of the README. The nodes are grouped into `named_route_groups` list
+    nodes with their detail nodes, all detail nodes of a group share a named route.
+    """
+    named_route_groups = max(min(named_route_groups, size), 1) if size else 0
+    list_nodes = []
+    for group in range(named_route_groups):
+        list_url = '/%s/benchmark-app-%d/' % (language, group)
+        list_nodes.append(NavigationNode(
+            title='Benchmark app %d' % group,
+            url=list_url,
+            id='app-%d' % group,
+            attr={
+                'component': 'benchmark-list',
+                'vue_js_router_name': 'benchmark-list-%d' % group,
+                'fetch_url': '/api%s' % list_url,
+                'absolute_url': list_url,
+            }
+        ))
+
+    detail_nodes = []
+    for index in range(size - named_route_groups):
+        list_node = list_nodes[index % named_route_groups]
+        url = '%sitem-%d/' % (list_node.get_absolute_url(), index)
+        detail_nodes.append(NavigationNode(
+            title='Benchmark item %d' % index,
+            url=url,
+            id='item-%d' % index,
+            parent_id=list_node.id,
+            attr={
+                'component': 'benchmark-detail',
+                'vue_js_router_name': 'benchmark-detail',
+                'absolute_url': url,
+                'fetch_url': '/api%s' % url,
+                'named_route_path_pattern': ':slug%d' % (index % named_route_groups),
+                'url_params': {'slug': 'item-%d' % index},
+            }
+        ))
+
+    # Link the nodes like the menu pool does.
+    nodes_by_id = {node.id: node for node in list_nodes}
+    for node in list_nodes + detail_nodes:
+        node.namespace = SYNTHETIC_APPHOOK_MENU
+        if node.parent_id:
+            node.parent = nodes_by_id[node.parent_id]
+            node.parent.children.append(node)
+
+    return list_nodes + detail_nodes
+
+
+def get_benchmark_request(language):
+    # The requested URL doesn't match any node, no route contains fetched data.
+    request = RequestFactory().get('/%s/vue-js-router-benchmark/' % language)
+    request.user = AnonymousUser()
+    request.session = {}
+    request.LANGUAGE_CODE = language
+    return request
+
+
+def benchmark_vue_js_router(apphook_nodes, language, repeat):
+    """
+    Builds the router `repeat` times and returns the durations (in seconds) of each stage (`{stage: [durations]}`).
+    Every run uses a new renderer, the router is never taken from the renderer of a previous run.
+    """
+    durations = {stage: [] for stage in BENCHMARK_STAGES}
+    router_template = Template(ROUTER_TEMPLATE)
+
+    with translation.override(language):
+        for __ in range(repeat):
+            request = get_benchmark_request(language)
+            renderer = SyntheticMenuRenderer(menu_pool, request, apphook_nodes)
+            nodes = renderer._mark_selected(renderer._build_nodes())
+            modifier = VueJsMenuModifier(renderer=renderer)
+
+            started = time.perf_counter()
+            router_nodes = modifier.modify(request, nodes, None, None, False, False)
+            durations['modify'].append(time.perf_counter() - started)
+
+            # Routes taken from the cache don't have their router page yet.
+            router_pages = modifier.get_router_pages(request=request, nodes=router_nodes)
+            for node in router_nodes:
+                if node.attr.get('is_page') and not node.attr.get('router_page'):
+                    node.attr['router_page'] = router_pages.get(node.id)
+
+            started = time.perf_counter()
+            for node in router_nodes:
+                get_node_route(request=request, node=node, renderer=renderer)
+            durations['get_node_route'].append(time.perf_counter() - started)
+
+            renderer = SyntheticMenuRenderer(menu_pool, request, apphook_nodes)
+            started = time.perf_counter()
+            get_vue_js_router(context={'cms_menu_renderer': renderer, 'request': request}, request=request)
+            durations['get_vue_js_router'].append(time.perf_counter() - started)
+
+            renderer = SyntheticMenuRenderer(menu_pool, request, apphook_nodes)
+            started = time.perf_counter()
+            router_template.render(Context({'cms_menu_renderer': renderer, 'request': request}))
+            durations['template_tag'].append(time.perf_counter() - started)
+
+    return durations
+
+
+def get_benchmark_summary(durations):
+    return {
+        stage: {
+            'min': min(stage_durations),
+            'median': statistics.median(stage_durations),
+        } for stage, stage_durations in durations.items()
+    }
@@ -0,0 +1,13 @@
+from django.db import models
+
+from djangocms_spa_vue_js.models import DjangocmsVueJsMixin
+
+
+class Article(DjangocmsVueJsMixin):
+    url = models.CharField(max_length=255)
+
+    class Meta:
+        app_label = 'djangocms_spa_vue_js'
+
+    def get_absolute_url(self):
+        return self.url
@@ -0,0 +1,98 @@
+import os
+
+SECRET_KEY = 'djangocms-spa-vue-js-tests'
+DEBUG = False
+SITE_ID = 1
+ROOT_URLCONF = 'tests.urls'
+ALLOWED_HOSTS = ['testserver']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+DEFAULT_AUTO_FIELD = 'django.db.models.AutoField'
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.admin',
+    'django.contrib.sites',
+    'django.contrib.messages',
+    'cms',
+    'menus',
+    'treebeard',
+    'sekizai',
+    'djangocms_spa',
+    'djangocms_spa_vue_js',
+]
+
+MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.locale.LocaleMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'cms.middleware.user.CurrentUserMiddleware',
+    'cms.middleware.page.CurrentPageMiddleware',
+    'cms.middleware.toolbar.ToolbarMiddleware',
+    'cms.middleware.language.LanguageCookieMiddleware',
+]
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [os.path.join(os.path.dirname(__file__), 'templates')],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'sekizai.context_processors.sekizai',
+                'cms.context_processors.cms_settings',
+            ],
+        },
+    },
+]
+
+LANGUAGE_CODE = 'en'
+LANGUAGES = [
+    ('en', 'English'),
+    ('de', 'German'),
+]
+USE_I18N = True
+
+CMS_LANGUAGES = {
+    SITE_ID: [
+        {'code': 'en', 'name': 'English', 'fallbacks': ['de']},
+        {'code': 'de', 'name': 'German', 'fallbacks': ['en']},
+    ],
+    'default': {
+        'hide_untranslated': False,
+        'redirect_on_fallback': False,
+    },
+}
+CMS_TEMPLATES = [
+    ('index.html', 'Index'),
+    ('content.html', 'Content'),
+]
+
+DJANGOCMS_SPA_TEMPLATES = {
+    'index.html': {
+        'frontend_component_name': 'index',
+        'partials': ['menu', 'footer'],
+    },
+    'content.html': {
+        'frontend_component_name': 'content',
+        'partials': ['footer'],
+    },
+}
+DJANGOCMS_SPA_DEFAULT_TEMPLATE = 'index.html'
+DJANGOCMS_SPA_VUE_JS_ERROR_404_TEMPLATE = 'index.html'
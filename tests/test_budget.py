@@ -0,0 +1,124 @@
+import tracemalloc
+
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import Client, RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import translation
+from menus.menu_pool import menu_pool
+
+from djangocms_spa_vue_js.url_helpers import clear_resolved_urls
+from djangocms_spa_vue_js.views import VueRouterView
+
+from .benchmark_helpers import create_synthetic_page_tree
+
+ROUTER_TEMPLATE = '{% load router_tags %}{% vue_js_router %}'
+
+
+class BudgetRouterView(VueRouterView):
+    """
+    A router view that renders the router only, independent of the templates of the project.
+    """
+    fetch_url = '/'
+
+    def render_to_response(self, context, **response_kwargs):
+        return HttpResponse(Template(ROUTER_TEMPLATE).render(Context(context)))
+
+
+def measure_queries_and_allocations(function):
+    """
+    Calls the function and returns the number of SQL queries and the peak of the memory allocated by the call in bytes.
+    """
+    is_tracing = tracemalloc.is_tracing()
+    if not is_tracing:
+        tracemalloc.start()
+
+    try:
+        allocated_before, __ = tracemalloc.get_traced_memory()
+        with CaptureQueriesContext(connection) as captured_queries:
+            function()
+            # The query log is reset by the next request.
+            query_count = len(captured_queries)
+        __, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not is_tracing:
+            tracemalloc.stop()
+
+    return query_count, max(peak - allocated_before, 0)
+
+
+def measure_request_budget(page, language):
+    """
+    Returns the number of SQL queries and the allocation peak of a rendered CMS page and a rendered `VueRouterView`
+    (`{view: (queries, peak)}`).
+    """
+    client = Client()
+    page_url = page.get_absolute_url(language=language)
+
+    def render_cms_page():
+        response = client.get(page_url)
+        if response.status_code != 200:
+            raise RuntimeError('The CMS page %s returned %s.' % (page_url, response.status_code))
+
+    def render_router_view():
+        # The requested URL doesn't match any node, no route contains fetched data.
+        request = RequestFactory().get('/%s/vue-js-router-budget/' % language)
+        request.user = AnonymousUser()
+        request.session = {}
+        request.LANGUAGE_CODE = language
+        with translation.override(language):
+            BudgetRouterView.as_view()(request)
+
+    measurements = {}
+    for view, render in [('cms_page', render_cms_page), ('router_view', render_router_view)]:
+        # Every view builds the menu from scratch.
+        menu_pool.clear(all=True)
+        clear_resolved_urls()
+        measurements[view] = measure_queries_and_allocations(render)
+    return measurements
+
+
+# Every request builds the menu and the router from scratch.
+@override_settings(
+    CMS_PAGE_CACHE=False,
+    CMS_PLACEHOLDER_CACHE=False,
+    CMS_PLUGIN_CACHE=False,
+    DJANGOCMS_SPA_CACHE_TIMEOUT=0,
+    DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT=0,
+    DJANGOCMS_SPA_VUE_JS_PARTIALS_CACHE_TIMEOUT=0,
+)
+class RequestBudgetTestCase(TestCase):
+    """
+    Counts the SQL queries and the allocation peak (`tracemalloc`) of a CMS page and a router view for growing page
+    trees to catch N+1 queries and growing allocations.
+    """
+    sizes = [10, 40]
+    depth = 3
+    max_queries_per_page = 0
+    max_bytes_per_page = 16 * 1024
+
+    def measure_tree(self, size):
+        with transaction.atomic():
+            pages = create_synthetic_page_tree(size=size, depth=self.depth, language='en')
+
+            # The first requests compile templates, import modules, etc.
+            measure_request_budget(page=pages[-1], language='en')
+            measurements = measure_request_budget(page=pages[-1], language='en')
+            transaction.set_rollback(True)
+
+        return measurements
+
+    def test_budget_per_page(self):
+        smallest_size, largest_size = self.sizes
+        smallest_measurements = self.measure_tree(smallest_size)
+        largest_measurements = self.measure_tree(largest_size)
+
+        for view, (smallest_queries, smallest_peak) in smallest_measurements.items():
+            largest_queries, largest_peak = largest_measurements[view]
+            with self.subTest(view=view):
+                queries_per_page = (largest_queries - smallest_queries) / (largest_size - smallest_size)
+                bytes_per_page = (largest_peak - smallest_peak) / (largest_size - smallest_size)
+                self.assertLessEqual(queries_per_page, self.max_queries_per_page)
+                self.assertLessEqual(bytes_per_page, self.max_bytes_per_page)
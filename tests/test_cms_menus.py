@@ -0,0 +1,125 @@
+from unittest import mock
+
+from cms.api import create_page, create_title
+from cms.constants import TEMPLATE_INHERITANCE_MAGIC
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from menus.base import NavigationNode
+from menus.menu_pool import menu_pool
+
+from djangocms_spa_vue_js import menu_helpers
+from djangocms_spa_vue_js.cms_menus import get_router_cms_pages
+from djangocms_spa_vue_js.manifest_helpers import (get_router_manifest, get_vue_js_router_manifest,
+                                                   get_vue_js_routes_for_languages)
+from djangocms_spa_vue_js.menu_helpers import get_node_route_for_cms_page
+from djangocms_spa_vue_js.router_helpers import VueJsRoute
+
+
+class RouterCMSPagesTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.home = create_page('Home', 'index.html', 'en', published=True)
+        self.home.set_as_homepage()
+
+    def create_pages(self, count):
+        pages = []
+        for index in range(count):
+            parent = pages[-1] if index % 2 else self.home
+            pages.append(create_page('Page %d' % index, TEMPLATE_INHERITANCE_MAGIC, 'en', parent=parent,
+                                     published=True))
+        return [page.publisher_public for page in pages]
+
+    def create_german_page(self):
+        # A page without an English title, English requests fall back to the German title.
+        create_title('de', 'Start', self.home)
+        self.home.publish('de')
+        return create_page('Seite', 'content.html', 'de', parent=self.home, published=True).publisher_public
+
+    def test_get_router_cms_pages_queries(self):
+        for count in [2, 10]:
+            page_ids = [page.pk for page in self.create_pages(count)]
+
+            # One query for the titles and one for the templates of the ancestors, independent of the page count.
+            with self.assertNumQueries(2):
+                router_cms_pages = get_router_cms_pages(page_ids=page_ids, language='en', site_id=1)
+
+            self.assertEqual(set(router_cms_pages), set(page_ids))
+            self.assertEqual({router_cms_page.template for router_cms_page in router_cms_pages.values()},
+                             {'index.html'})
+
+    def test_get_router_cms_pages_fallback_language(self):
+        page = self.create_german_page()
+
+        router_cms_page = get_router_cms_pages(page_ids=[page.pk], language='en', site_id=1)[page.pk]
+
+        self.assertEqual(router_cms_page.title_slug, 'seite')
+        self.assertEqual(router_cms_page.title_id, page.title_set.get(language='de').pk)
+
+    def test_router_queries_independent_of_page_count(self):
+        client = Client()
+
+        def get_home_page():
+            menu_pool.clear(all=True)
+            cache.clear()
+            return client.get(self.home.get_absolute_url(language='en'))
+
+        self.create_pages(2)
+        get_home_page()
+        with CaptureQueriesContext(connection) as captured_queries:
+            self.assertEqual(get_home_page().status_code, 200)
+        # The query log is reset by the next request.
+        query_count = len(captured_queries)
+
+        self.create_pages(10)
+        get_home_page()
+        with self.assertNumQueries(query_count):
+            response = get_home_page()
+        self.assertContains(response, 'page-9')
+
+    def test_selected_page_with_fallback_title(self):
+        page = self.create_german_page()
+        router_cms_page = get_router_cms_pages(page_ids=[page.pk], language='en', site_id=1)[page.pk]
+
+        request = RequestFactory().get('/en/seite/')
+        request.user = AnonymousUser()
+        request.session = {}
+        request.LANGUAGE_CODE = 'en'
+        node = NavigationNode(title='Seite', url='/en/seite/', id=page.pk, attr={'is_page': True})
+        node.selected = True
+
+        route = get_node_route_for_cms_page(request, node, VueJsRoute(), router_cms_page)
+
+        self.assertEqual(route.path, '/seite')
+        self.assertEqual(route.fetched['response']['data']['meta']['title'], 'Seite')
+
+    @override_settings(DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_TIMEOUT=0)
+    def test_routes_for_languages_share_page_parts(self):
+        create_title('de', 'Start', self.home)
+        self.home.publish('de')
+        for index in range(3):
+            page = create_page('Page %d' % index, 'content.html', 'en', parent=self.home)
+            create_title('de', 'Seite %d' % index, page)
+            page.publish('en')
+            page.publish('de')
+
+        def get_request(language):
+            request = RequestFactory().get('/%s/vue-js-router-warmup/' % language)
+            request.user = AnonymousUser()
+            request.session = {}
+            request.LANGUAGE_CODE = language
+            return request
+
+        menu_pool.clear(all=True)
+        with mock.patch.object(menu_helpers, 'get_node_template_name',
+                               wraps=menu_helpers.get_node_template_name) as get_node_template_name:
+            routes = get_vue_js_routes_for_languages(request=get_request('en'), languages=['en', 'de'])
+
+        # The template of each page is resolved once for both languages.
+        self.assertEqual(get_node_template_name.call_count, 4)
+        self.assertIn(b'/seite-0', get_router_manifest(routes['de']).content)
+        for language in ['en', 'de']:
+            self.assertEqual(get_router_manifest(routes[language]).content,
+                             get_vue_js_router_manifest(request=get_request(language), language=language).content)
@@ -0,0 +1,35 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from djangocms_spa_vue_js.decorators import cache_view_per_variant
+
+
+class CachedView(object):
+    add_language_code = False
+
+    def __init__(self, request):
+        self.request = request
+
+    def get_cache_key(self):
+        return None
+
+    @cache_view_per_variant
+    def get(self):
+        return HttpResponse(self.request.get_full_path())
+
+
+class CacheViewPerVariantTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def get(self, path):
+        request = RequestFactory().get(path)
+        request.user = AnonymousUser()
+        return CachedView(request).get()
+
+    def test_cache_key_falls_back_to_url(self):
+        self.assertEqual(self.get('/first/').content, b'/first/')
+        self.assertEqual(self.get('/second/').content, b'/second/')
+        self.assertEqual(cache.get('/first/:anonymous').content, b'/first/')
@@ -0,0 +1,65 @@
+from cms.api import add_plugin
+from cms.models import CMSPlugin, Placeholder
+from cms.plugin_pool import plugin_pool
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+from djangocms_spa import content_helpers
+from djangocms_spa.cms_plugins import SPAPluginBase
+
+from djangocms_spa_vue_js.placeholder_helpers import get_frontend_data_dict_for_placeholders
+
+
+class ContainerPlugin(SPAPluginBase):
+    name = 'Container'
+    frontend_component_name = 'cmp-container'
+
+    def render_spa(self, request, context, instance):
+        context['content']['id'] = instance.pk
+        return context
+
+
+class FrontendDataDictForPlaceholdersTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        plugin_pool.register_plugin(ContainerPlugin)
+
+    @classmethod
+    def tearDownClass(cls):
+        plugin_pool.unregister_plugin(ContainerPlugin)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.request = RequestFactory().get('/en/')
+        self.request.user = AnonymousUser()
+        self.request.LANGUAGE_CODE = 'en'
+
+    def test_plugin_without_plugin_model_instance(self):
+        # The plugin model instance of the alias plugin is missing, the plugin can't be downcast.
+        placeholder = Placeholder.objects.create(slot='main')
+        CMSPlugin.add_root(placeholder=placeholder, plugin_type='AliasPlugin', language='en', position=0)
+
+        data = get_frontend_data_dict_for_placeholders(placeholders=[placeholder], request=self.request)
+
+        self.assertEqual(data, {'main': {'type': 'cmp-main', 'plugins': [{}]}})
+        self.assertEqual(data, content_helpers.get_frontend_data_dict_for_placeholders(placeholders=[placeholder],
+                                                                                       request=self.request))
+
+    def test_nested_plugin_tree(self):
+        # The copied serializers have to return the same data as the pinned version of djangocms_spa.
+        placeholders = [Placeholder.objects.create(slot='main'), Placeholder.objects.create(slot='sidebar')]
+        for language in ['en', 'de']:
+            for placeholder in placeholders:
+                for index in range(2):
+                    parent = add_plugin(placeholder, ContainerPlugin, language)
+                    child = add_plugin(placeholder, ContainerPlugin, language, target=parent)
+                    add_plugin(placeholder, ContainerPlugin, language, target=child)
+                    add_plugin(placeholder, ContainerPlugin, language, target=parent)
+
+        data = get_frontend_data_dict_for_placeholders(placeholders=placeholders, request=self.request)
+
+        self.assertEqual(data, content_helpers.get_frontend_data_dict_for_placeholders(placeholders=placeholders,
+                                                                                       request=self.request))
+        self.assertEqual(len(data['main']['plugins']), 2)
+        self.assertEqual(len(data['main']['plugins'][0]['plugins']), 2)
+        self.assertEqual(len(data['main']['plugins'][0]['plugins'][0]['plugins']), 1)
@@ -0,0 +1,34 @@
+from cms.api import create_page, create_title
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.utils import translation
+
+from djangocms_spa_vue_js.prefetch_helpers import get_fetched_data_for_cms_pages
+
+
+class FetchedDataForCMSPagesTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.home = create_page('Home', 'index.html', 'en', published=True)
+        self.home.set_as_homepage()
+
+    def get_request(self, language):
+        request = RequestFactory().get('/%s/' % language)
+        request.user = AnonymousUser()
+        request.session = {}
+        request.LANGUAGE_CODE = language
+        return request
+
+    def test_fallback_title(self):
+        # A page without an English title, English requests fall back to the German title.
+        create_title('de', 'Start', self.home)
+        self.home.publish('de')
+        page = create_page('Seite', 'content.html', 'de', parent=self.home, published=True).publisher_public
+        home = self.home.reload().publisher_public
+
+        with translation.override('en'):
+            fetched_data = get_fetched_data_for_cms_pages(self.get_request('en'), page_ids=[page.pk, home.pk])
+
+        self.assertEqual(fetched_data[page.pk]['response']['data']['meta']['title'], 'Seite')
+        self.assertEqual(fetched_data[home.pk]['response']['data']['meta']['title'], 'Home')
@@ -0,0 +1,86 @@
+from unittest import mock
+
+from cms.api import create_page
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from menus.menu_pool import menu_pool
+
+from djangocms_spa_vue_js import cms_menus, json_helpers
+from djangocms_spa_vue_js.cache_helpers import get_route_skeleton_cache_key
+from djangocms_spa_vue_js.menu_helpers import get_node_route
+
+
+@override_settings(CMS_PAGE_CACHE=False, DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_LOCK_TIMEOUT=1)
+class RouteSkeletonTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        menu_pool.clear(all=True)
+        self.home = create_page('Home', 'index.html', 'en', published=True)
+        self.home.set_as_homepage()
+        for index in range(3):
+            create_page('Page %d' % index, 'content.html', 'en', parent=self.home, published=True)
+        self.client = Client()
+        self.cache_key = get_route_skeleton_cache_key(language='en', site_id=1, variant='anonymous')
+        self.lock_cache_key = '%s_lock' % self.cache_key
+
+    def get_built_route_count(self):
+        """
+        Requests the home page and returns the number of routes that have been built instead of taken from the cache.
+        """
+        with mock.patch.object(cms_menus, 'get_node_route', wraps=get_node_route) as built_node_route:
+            response = self.client.get('/en/')
+        self.assertEqual(response.status_code, 200)
+        return built_node_route.call_count
+
+    def test_cached_routes(self):
+        route_count = self.get_built_route_count()
+
+        # Only the route of the selected node is built again.
+        self.assertEqual(self.get_built_route_count(), 1)
+        self.assertEqual(len(cache.get(self.cache_key)['routes']), route_count - 1)
+
+    @override_settings(DJANGOCMS_SPA_VUE_JS_ROUTER_CACHE_SOFT_TIMEOUT=-1)
+    def test_stale_routes_served_while_locked(self):
+        route_count = self.get_built_route_count()
+
+        # Another process holds the lock and rebuilds the stale routes.
+        cache.add(self.lock_cache_key, True)
+        with mock.patch.object(cms_menus, 'wait_for_route_skeleton_lock') as wait_for_route_skeleton_lock:
+            self.assertEqual(self.get_built_route_count(), 1)
+        wait_for_route_skeleton_lock.assert_not_called()
+
+        cache.delete(self.lock_cache_key)
+        self.assertEqual(self.get_built_route_count(), route_count)
+        self.assertIsNone(cache.get(self.lock_cache_key))
+
+    def test_expired_routes_rebuilt(self):
+        route_count = self.get_built_route_count()
+
+        route_skeleton = cache.get(self.cache_key)
+        for route_entry in route_skeleton['routes'].values():
+            route_entry['expires_at'] = 0
+        cache.set(self.cache_key, route_skeleton)
+
+        self.assertEqual(self.get_built_route_count(), route_count)
+        self.assertEqual(self.get_built_route_count(), 1)
+
+    def test_lock_released_after_exception(self):
+        with mock.patch.object(cms_menus, 'get_node_route', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.get('/en/')
+        self.assertIsNone(cache.get(self.lock_cache_key))
+
+        # The next request builds the routes without waiting for the lock.
+        with mock.patch.object(cms_menus, 'wait_for_route_skeleton_lock') as wait_for_route_skeleton_lock:
+            self.assertGreater(self.get_built_route_count(), 1)
+        wait_for_route_skeleton_lock.assert_not_called()
+
+    @override_settings(DJANGOCMS_SPA_VUE_JS_COMPACT_ROUTER=True)
+    def test_cached_compact_fragments(self):
+        self.get_built_route_count()
+
+        # Only the compact fragment of the selected route is encoded again.
+        with mock.patch.object(json_helpers, 'get_compact_route_fragment',
+                               wraps=json_helpers.get_compact_route_fragment) as get_compact_route_fragment:
+            self.assertEqual(self.get_built_route_count(), 1)
+        self.assertEqual(get_compact_route_fragment.call_count, 1)
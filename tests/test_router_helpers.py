@@ -0,0 +1,43 @@
+from django.test import RequestFactory, SimpleTestCase
+
+from djangocms_spa_vue_js.prefetch_helpers import get_prefetched_route_names
+from djangocms_spa_vue_js.router_helpers import get_route_path_index, match_route_path
+from djangocms_spa_vue_js.views import VueRouterView
+
+
+class RoutePathIndexTestCase(SimpleTestCase):
+    routes = [
+        {'name': 'home', 'path': '/'},
+        {'name': 'page', 'path': '/page'},
+        {'name': 'news', 'path': '/en/news/'},
+        {'name': 'news-detail', 'path': '/en/news/:slug/'},
+        {'name': 'news-archive', 'path': '/en/news/archive/'},
+        {'name': 'news-comments', 'path': '/en/news/:slug/comments/'},
+    ]
+
+    def assertRouteMatch(self, path, name, params=None):
+        route_match = match_route_path(get_route_path_index(self.routes), path)
+        self.assertEqual((route_match.route['name'], route_match.params), (name, params or {}))
+
+    def test_match_route_path(self):
+        self.assertRouteMatch('/en/', 'home')
+        self.assertRouteMatch('/en/page/', 'page')
+        self.assertRouteMatch('/en/news/', 'news')
+        self.assertRouteMatch('/en/news/archive/', 'news-archive')
+        self.assertRouteMatch('/en/news/first/', 'news-detail', {'slug': 'first'})
+        self.assertRouteMatch('/en/news/archive/comments/', 'news-comments', {'slug': 'archive'})
+        self.assertIsNone(match_route_path(get_route_path_index(self.routes), '/en/news/first/second/'))
+
+    def test_active_route(self):
+        view = VueRouterView()
+        view.request = RequestFactory().get('/en/page/')
+        routes = [
+            {'name': 'home', 'path': '/', 'api': {'fetched': {}}},
+            {'name': 'page', 'path': '/page', 'api': {'fetched': {}}},
+            {'name': 'apphook', 'path': '/apphook', 'api': {'fetched': {}}},
+        ]
+        self.assertEqual(view.get_active_route(routes)['name'], 'page')
+
+        # Prefetched routes are never the active route.
+        get_prefetched_route_names(view.request).update(['home', 'page'])
+        self.assertEqual(view.get_active_route(routes)['name'], 'apphook')
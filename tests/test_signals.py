@@ -0,0 +1,145 @@
+from unittest import mock
+
+from cms import operations
+from cms.admin.pageadmin import PageAdmin
+from cms.api import create_page
+from cms.models import StaticPlaceholder
+from cms.signals import post_obj_operation
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from menus.menu_pool import menu_pool
+
+from djangocms_spa_vue_js import cms_menus, partial_helpers
+from djangocms_spa_vue_js.cache_helpers import get_partials_version, get_route_skeleton_cache_key, get_router_version
+from djangocms_spa_vue_js.menu_helpers import get_node_route
+from djangocms_spa_vue_js.partial_helpers import content_helpers
+
+from .models import Article
+
+
+@override_settings(CMS_PAGE_CACHE=False)
+class RouteInvalidationSignalsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        menu_pool.clear(all=True)
+        self.home = create_page('Home', 'index.html', 'en', published=True)
+        self.home.set_as_homepage()
+        self.pages = [
+            create_page('Page %d' % index, 'content.html', 'en', parent=self.home, published=True)
+            for index in range(3)
+        ]
+        self.client = Client()
+        self.cache_key = get_route_skeleton_cache_key(language='en', site_id=1, variant='anonymous')
+
+        # The first request caches the routes, the next one only builds the route of the selected node.
+        self.request_home_page()
+        self.assertEqual(self.request_home_page(), (1, False))
+
+    def request_home_page(self):
+        """
+        Requests the home page and returns the number of routes that have been built instead of taken from the cache
+        and whether the route skeleton has been written to the cache.
+        """
+        with mock.patch.object(cms_menus, 'get_node_route', wraps=get_node_route) as built_node_route:
+            with mock.patch.object(cms_menus, 'set_route_skeleton', wraps=cms_menus.set_route_skeleton) as written:
+                response = self.client.get('/en/')
+        self.assertEqual(response.status_code, 200)
+        return built_node_route.call_count, written.called
+
+    def send_post_obj_operation(self, operation, obj):
+        # The admin sends these signals (e.g. after moving a page).
+        post_obj_operation.send(sender=PageAdmin, operation=operation, request=None, token='token', obj=obj)
+
+    def test_publish(self):
+        self.pages[0].publish('en')
+        menu_pool.clear(all=True)
+
+        # The route of the published page is rebuilt together with the route of the selected node.
+        self.assertEqual(self.request_home_page(), (2, True))
+        self.assertEqual(self.request_home_page(), (1, False))
+
+    def test_unpublish(self):
+        self.pages[0].unpublish('en')
+        menu_pool.clear(all=True)
+
+        self.assertEqual(self.request_home_page(), (1, True))
+        node_keys = cache.get(self.cache_key)['routes']
+        self.assertNotIn('CMSMenu:%d' % self.pages[0].publisher_public_id, node_keys)
+        self.assertEqual(len(node_keys), 2)
+
+    def test_move(self):
+        page = self.pages[2].reload()
+        page.move_page(self.pages[0].reload().node, position='first-child')
+        self.send_post_obj_operation(operations.MOVE_PAGE, page)
+        menu_pool.clear(all=True)
+
+        self.assertEqual(self.request_home_page(), (2, True))
+        self.assertEqual(self.request_home_page(), (1, False))
+
+    def test_delete(self):
+        self.pages[0].reload().delete()
+        menu_pool.clear(all=True)
+
+        self.assertEqual(self.request_home_page(), (1, True))
+        self.assertEqual(len(cache.get(self.cache_key)['routes']), 2)
+
+    def test_model_save(self):
+        # A model route at the URL of a page, the routes of the pages are not checked again.
+        route_skeleton = cache.get(self.cache_key)
+        page = self.pages[0].publisher_public
+        route_entry = next(route_entry for node_key, route_entry in route_skeleton['routes'].items()
+                           if node_key.endswith(':%d' % page.pk))
+        route_entry['is_page'] = False
+        cache.set(self.cache_key, route_skeleton)
+
+        with CaptureQueriesContext(connection) as captured_queries:
+            Article.objects.create(url=route_entry['url'])
+        self.assertFalse(any('django_site' in query['sql'] for query in captured_queries))
+
+        self.assertEqual(self.request_home_page(), (2, True))
+        self.assertEqual(self.request_home_page(), (1, False))
+
+    def test_model_save_keeps_page_routes(self):
+        Article.objects.create(url='/en/article/')
+
+        self.assertEqual(self.request_home_page(), (1, True))
+        self.assertEqual(self.request_home_page(), (1, False))
+
+    def test_static_placeholder_publish(self):
+        router_version = get_router_version()
+        partials_version = get_partials_version()
+        # The partials of the pages created the static placeholder.
+        static_placeholder = StaticPlaceholder.objects.get(code='footer')
+
+        self.send_post_obj_operation(operations.PUBLISH_STATIC_PLACEHOLDER, static_placeholder)
+
+        self.assertNotEqual(get_router_version(), router_version)
+        self.assertNotEqual(get_partials_version(), partials_version)
+        # The routes don't contain the static placeholders, they stay cached.
+        self.assertEqual(self.request_home_page(), (1, False))
+
+    def test_static_placeholder_partials(self):
+        static_placeholder = StaticPlaceholder.objects.get(code='footer')
+        request = RequestFactory().get('/en/')
+        request.LANGUAGE_CODE = 'en'
+        request.user = AnonymousUser()
+
+        def render_partials():
+            with mock.patch.object(partial_helpers.content_helpers, 'get_frontend_data_dict_for_partials',
+                                   wraps=content_helpers.get_frontend_data_dict_for_partials) as rendered_partials:
+                partial_helpers.get_frontend_data_dict_for_partials(partials=['footer'], request=request)
+            return rendered_partials.called
+
+        self.assertTrue(render_partials())
+        self.assertFalse(render_partials())
+
+        # Saving the draft doesn't change the published partials, they are still served from the cache.
+        static_placeholder.save()
+        self.assertFalse(render_partials())
+
+        self.send_post_obj_operation(operations.PUBLISH_STATIC_PLACEHOLDER, static_placeholder)
+        self.assertTrue(render_partials())
+        self.assertFalse(render_partials())
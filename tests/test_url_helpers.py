@@ -0,0 +1,70 @@
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import path, register_converter, reverse
+from django.utils import translation
+
+from djangocms_spa_vue_js.menu_helpers import get_url_name
+from djangocms_spa_vue_js.url_helpers import (clear_resolved_urls, clear_url_templates, resolve_url,
+                                              reverse_with_template)
+
+
+class PaddedNumberConverter(object):
+    regex = '[0-9]+'
+
+    def to_python(self, value):
+        return int(value)
+
+    def to_url(self, value):
+        return '%08d' % int(value)
+
+
+register_converter(PaddedNumberConverter, 'padded')
+
+
+def detail_view(request, **kwargs):
+    return HttpResponse()
+
+
+urlpatterns = [
+    path('items/<padded:number>/', detail_view, name='padded_item_detail'),
+    path('items/<slug:slug>/<int:pk>/', detail_view, name='item_detail'),
+]
+
+
+@override_settings(ROOT_URLCONF='tests.test_url_helpers')
+class ReverseWithTemplateTestCase(SimpleTestCase):
+    def setUp(self):
+        clear_url_templates()
+
+    def test_same_url_as_reverse(self):
+        for index in range(2):
+            kwargs = {'slug': 'item-%d' % index, 'pk': index}
+            self.assertEqual(reverse_with_template('item_detail', kwargs=kwargs),
+                             reverse('item_detail', kwargs=kwargs))
+
+    def test_converter_to_url(self):
+        for number in [7, 42]:
+            kwargs = {'number': number}
+            self.assertEqual(reverse_with_template('padded_item_detail', kwargs=kwargs),
+                             reverse('padded_item_detail', kwargs=kwargs))
+        self.assertEqual(reverse_with_template('padded_item_detail', kwargs={'number': 42}), '/items/00000042/')
+
+
+class ResolveUrlTestCase(SimpleTestCase):
+    def setUp(self):
+        clear_resolved_urls()
+
+    def test_language_prefix(self):
+        with translation.override('de'):
+            self.assertEqual(resolve_url('/de/admin/').url_name, 'index')
+        with translation.override('en'):
+            self.assertIsNone(resolve_url('/de/admin/'))
+            self.assertEqual(resolve_url('/en/admin/').url_name, 'index')
+
+    def test_view_not_importable(self):
+        # Admin views are bound methods, they can't be imported by their dotted path.
+        with translation.override('de'):
+            resolved_url = resolve_url('/de/admin/')
+            self.assertEqual(get_url_name('/de/admin/'), 'index')
+        with self.assertRaises((AttributeError, ImportError)):
+            resolved_url.view
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from cms.api import create_page
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import path, reverse
+
+from djangocms_spa_vue_js.cache_helpers import update_router_version
+from djangocms_spa_vue_js.views import VueRouterListView, VueRouterView
+
+from .models import Article
+from .urls import urlpatterns as cms_urlpatterns
+
+
+class ArticleListView(VueRouterListView):
+    model = Article
+    template_name = 'index.html'
+
+
+urlpatterns = [
+    path('router/', VueRouterView.as_view(template_name='index.html'), name='router'),
+    path('articles/', ArticleListView.as_view(), name='article_list'),
+] + cms_urlpatterns
+
+
+class VueRouterManifestViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        home = create_page('Home', 'index.html', 'en', published=True)
+        home.set_as_homepage()
+        create_page('Page', 'content.html', 'en', parent=home, published=True)
+        self.client = Client()
+        self.url = reverse('djangocms_spa_vue_js:vue_js_router_manifest', kwargs={'language': 'en'})
+
+    def test_conditional_request_without_building_the_manifest(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+
+        with mock.patch('djangocms_spa_vue_js.views.get_cached_vue_js_router_manifest') as get_manifest:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        get_manifest.assert_not_called()
+
+        # All encodings share the weak ETag.
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 304)
+
+        update_router_version()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+@override_settings(ROOT_URLCONF='tests.test_views', CMS_PAGE_CACHE=False)
+class VueRouterViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.home = create_page('Home', 'index.html', 'en', published=True)
+        self.home.set_as_homepage()
+        self.client = Client()
+
+    def test_conditional_request(self):
+        response = self.client.get('/router/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        with mock.patch.object(VueRouterView, 'get_vue_js_router') as get_vue_js_router:
+            response = self.client.get('/router/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        get_vue_js_router.assert_not_called()
+
+        # Publishing a page changes the ETag before the routes are rebuilt.
+        self.home.publish('en')
+        response = self.client.get('/router/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_view_conditional_request(self):
+        Article.objects.create(url='/en/article-1/')
+        etag = self.client.get('/articles/')['ETag']
+
+        # The list is validated with one aggregate query.
+        with self.assertNumQueries(1):
+            response = self.client.get('/articles/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Added objects change the ETag, even without signals.
+        Article.objects.bulk_create([Article(url='/en/article-2/')])
+        response = self.client.get('/articles/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
@@ -0,0 +1,11 @@
+from django.conf.urls.i18n import i18n_patterns
+from django.contrib import admin
+from django.urls import include, path
+
+urlpatterns = [
+    path('api/', include('djangocms_spa.urls', namespace='api')),
+    path('api/vue-js/', include('djangocms_spa_vue_js.urls')),
+] + i18n_patterns(
+    path('admin/', admin.site.urls),
+    path('', include('cms.urls')),
+)